@@ -0,0 +1,59 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmark_rating import synthetic_ratings
+from rating_consensus import agency_panel, consensus_methods, consensus_table
+from rating_csv_v1 import agencies, build_panel, credit_scale_file, load_credit_scale, years
+from rating_index import RatingIndex
+
+# Consensus engine on a synthetic history: per-agency panels and every consensus method over the
+# whole panel, checked against the point-in-time index at each year end, then the typed Parquet
+# table against the wide CSV panel for file size and read time.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the multi-agency consensus engine and its Parquet output.")
+    parser.add_argument("--countries", type=int, default=200)
+    args = parser.parse_args()
+
+    scale = load_credit_scale(credit_scale_file)
+    ratings = synthetic_ratings(scale, args.countries)
+    countries = list(ratings['Country'].unique())
+
+    start = time.perf_counter()
+    values, action_years = agency_panel(ratings, scale, countries)
+    print(f"agency panels {values.shape} built in {time.perf_counter() - start:.3f} s")
+
+    # Year-end ratings in force must match the forward-filled agency series
+    index = RatingIndex(ratings, scale)
+    year_ends = pd.to_datetime([f"{year}-12-31" for year in years])
+    query_countries = np.repeat(countries, len(years))
+    query_dates = np.tile(year_ends, len(countries))
+    expected = index.agency_ratings(query_countries, query_dates).reshape(values.shape)
+    assert np.array_equal(values, expected, equal_nan=True)
+
+    for method in consensus_methods:
+        start = time.perf_counter()
+        table = consensus_table(values, action_years, countries, method=method)
+        elapsed = time.perf_counter() - start
+        consensus = table['Consensus'].to_numpy(dtype=float, na_value=np.nan).reshape(len(countries), len(years))
+        in_force = values[~np.isnan(consensus)]
+        # Any consensus lies between the lowest and highest rating in force
+        assert np.all(np.fmin.reduce(in_force, axis=-1) <= consensus[~np.isnan(consensus)])
+        assert np.all(consensus[~np.isnan(consensus)] <= np.fmax.reduce(in_force, axis=-1))
+        print(f"{method:<8} consensus over {len(table):,} country-years in {elapsed * 1000:6.1f} ms")
+    assert np.array_equal(table[list(agencies)].to_numpy(dtype=float, na_value=np.nan), values.reshape(-1, len(agencies)), equal_nan=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file, parquet_file = os.path.join(tmp, "output.csv"), os.path.join(tmp, "ratings.parquet")
+        build_panel(ratings, scale, countries).to_csv(csv_file, index=False)
+        table.to_parquet(parquet_file, index=False)
+        for label, path, read in [("wide CSV", csv_file, pd.read_csv), ("Parquet", parquet_file, pd.read_parquet)]:
+            start = time.perf_counter()
+            read(path)
+            print(f"{label:<9} {os.path.getsize(path) / 1024:8.1f} KB, read in {(time.perf_counter() - start) * 1000:6.1f} ms")
+        assert str(pd.read_parquet(parquet_file)['Consensus'].dtype) == 'Int8'
@@ -0,0 +1,90 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from rating_csv_v1 import agencies, build_panel, credit_scale_file, load_credit_scale, load_ratings, load_workers, years
+
+# Panel build on a synthetic rating history: the vectorized merge and forward fill against the
+# per-country loop rating_csv_v1.py used before (apply per row, iterrows, a Python forward fill
+# and one concat per country), which is reproduced here as the reference. Both must agree. The
+# history is also written out as one CSV per country to time loading the folder serially and with
+# the thread pool.
+
+
+# Synthetic histories: each country gets about `per_year` ratings a year from random agencies over
+# `span` years up to 2024, newest first like the country files, on distinct days
+def synthetic_ratings(scale, countries=200, span=50, per_year=3, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(countries):
+        count = rng.poisson(per_year * span)
+        days = rng.choice(np.arange(span * 365), size=min(count, span * 365), replace=False)
+        dates = pd.Timestamp(2024 - span + 1, 1, 1) + pd.to_timedelta(np.sort(days)[::-1], unit='D')
+        picks = scale.iloc[rng.integers(0, len(scale), len(dates))]
+        frames.append(pd.DataFrame({'Country': f'country {i:03d}', 'Agency': picks['Agency'].to_numpy(),
+                                    'Rating': picks['Rating'].to_numpy(), 'Outlook': 'Stable', 'Date': dates}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def legacy_panel(ratings, credit_scale_df, countries):
+    credit_scale = {}
+    for agency in agencies:
+        credit_scale[agency] = dict(zip(credit_scale_df[agency], credit_scale_df['Scale']))
+    out_df = pd.DataFrame(columns=['Country'] + years)
+    for country in countries:
+        df = ratings[ratings['Country'] == country].drop(columns='Country')
+        df = df.sort_values(by='Date', ascending=True)
+        df['Scale'] = df.apply(lambda row: credit_scale.get(row['Agency'], {}).get(row['Rating'], None), axis=1)
+        df.dropna(subset=['Scale'], inplace=True)
+        year_ratings = {}
+        for _, row in df.iterrows():
+            year_ratings[row['Date'].year] = row['Scale']
+        country_ratings = {}
+        last_value = None
+        for year in years:
+            if year in year_ratings:
+                last_value = year_ratings[year]
+            country_ratings[year] = last_value
+        new_row = pd.DataFrame([[country] + [country_ratings.get(y, '') for y in years]], columns=out_df.columns)
+        out_df = pd.concat([out_df, new_row], ignore_index=True)
+    return out_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the vectorized rating panel build with the per-country loop.")
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--span", type=int, default=50, help="Years of rating history per country")
+    parser.add_argument("--per-year", type=float, default=3.0, help="Average ratings per country and year")
+    args = parser.parse_args()
+
+    scale = load_credit_scale(credit_scale_file)
+    ratings = synthetic_ratings(scale, args.countries, args.span, args.per_year)
+    countries = list(ratings['Country'].unique())
+    print(f"{len(ratings):,} ratings for {len(countries)} countries over {args.span} years")
+
+    start = time.perf_counter()
+    expected = legacy_panel(ratings, pd.read_csv(credit_scale_file), countries)
+    legacy = time.perf_counter() - start
+    print(f"per-country loop  {legacy:8.3f} s")
+
+    start = time.perf_counter()
+    panel = build_panel(ratings, scale, countries)
+    vectorized = time.perf_counter() - start
+    print(f"vectorized        {vectorized:8.3f} s  ({legacy / vectorized:,.0f}x faster)")
+
+    assert list(panel['Country']) == countries
+    assert np.array_equal(panel[years].to_numpy(dtype=float, na_value=np.nan),
+                          expected[years].to_numpy(dtype=float, na_value=np.nan), equal_nan=True)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for country, df in ratings.groupby('Country'):
+            df.drop(columns='Country').to_csv(os.path.join(folder, f"{country}.csv"), index=False, date_format='%b %d %Y')
+        for workers in [1, load_workers]:
+            start = time.perf_counter()
+            loaded, _ = load_ratings(folder, workers)
+            print(f"load, {workers} threads  {time.perf_counter() - start:8.3f} s")
+        assert len(loaded) == len(ratings)
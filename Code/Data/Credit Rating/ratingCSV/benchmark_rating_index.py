@@ -0,0 +1,63 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmark_rating import synthetic_ratings
+from rating_csv_v1 import agencies, convert_ratings, credit_scale_file, load_credit_scale
+from rating_index import RatingIndex
+
+# Point-in-time rating lookups on a synthetic history: millions of random (country, date) queries
+# per agency and for the consensus in single vectorized calls, with a sample checked against a
+# brute-force scan of the ratings.
+
+
+# Latest rating by `agency` on or before `date`, scanning the converted ratings (file order breaks ties)
+def brute_force(converted, country, date, agency):
+    rows = converted[(converted['Country'] == country) & (converted['Agency'] == agency) & (converted['Date'] <= date)]
+    if rows.empty:
+        return np.nan
+    return rows.loc[rows['Date'] == rows['Date'].max(), 'Scale'].iloc[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time point-in-time sovereign rating lookups.")
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=2_000_000)
+    parser.add_argument("--checks", type=int, default=500, help="Queries verified by brute force")
+    args = parser.parse_args()
+
+    scale = load_credit_scale(credit_scale_file)
+    ratings = synthetic_ratings(scale, args.countries)
+    # Same-day ratings by one agency in a row, to exercise the tie rule
+    ratings = pd.concat([ratings, ratings.iloc[:50].assign(Rating=ratings['Rating'].iloc[50:100].to_numpy())]).sort_index(kind='stable')
+    start = time.perf_counter()
+    index = RatingIndex(ratings, scale)
+    print(f"index over {len(index.keys):,} ratings built in {time.perf_counter() - start:.3f} s")
+
+    rng = np.random.default_rng(1)
+    names = ratings['Country'].unique()
+    countries = rng.choice(names, args.queries)
+    dates = pd.Timestamp('1970-01-01') + pd.to_timedelta(rng.integers(0, 55 * 365, args.queries), unit='D')
+    converted = convert_ratings(ratings, scale)
+
+    for agency in agencies:
+        start = time.perf_counter()
+        values = index.rating(countries, dates, agency)
+        elapsed = time.perf_counter() - start
+        print(f"{agency:<10} {args.queries / elapsed:14,.0f} queries/s  ({np.isnan(values).mean():.1%} before a first rating)")
+
+        for i in rng.choice(args.queries, args.checks, replace=False):
+            expected = brute_force(converted, countries[i], dates[i], agency)
+            assert np.isnan(values[i]) and np.isnan(expected) or values[i] == expected, (countries[i], dates[i], agency)
+
+    start = time.perf_counter()
+    consensus = index.consensus(countries, dates)
+    elapsed = time.perf_counter() - start
+    print(f"{'consensus':<10} {args.queries / elapsed:14,.0f} queries/s")
+    sample = rng.choice(args.queries, args.checks, replace=False)
+    expected = index.agency_ratings(countries[sample], dates[sample])
+    for value, row in zip(consensus[sample], expected):
+        known = row[~np.isnan(row)]
+        assert np.isnan(value) if len(known) == 0 else value == np.median(known)
@@ -0,0 +1,96 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from rating_csv_v1 import (agencies, convert_ratings, credit_scale_file, input_folder, load_credit_scale, load_ratings,
+                           log_level, logger, years)
+
+# Multi-agency consensus ratings. build_panel merges every agency into one series per country, so
+# whichever agency published last wins. Here each agency keeps its own forward-filled series in a
+# (countries, years, agencies) array, and a consensus is combined across the agency axis for the
+# whole panel at once:
+#   median    median of the agencies with a rating in force
+#   worst     lowest rating in force
+#   recency   mean weighted by 0.5 ** (years since that agency's last rating action / half-life)
+# Consensus values are rounded to the scale with halves going down (the more conservative rating).
+#
+# The result is written as Parquet with one row per country and year: Country, Year (int16), one
+# int8 column per agency and Consensus (int8), null where no agency has rated the country yet.
+
+# Output
+output_file = "ratings.parquet"
+
+# median, worst or recency
+consensus_method = "median"
+
+# Years for a rating's weight to halve in the recency consensus
+recency_half_life = 2.0
+
+consensus_methods = ("median", "worst", "recency")
+
+
+# Combine ratings along the last axis (NaN = no rating in force); ages (same shape, in years since
+# each rating was published) are needed for the recency method only
+def combine(values, method=consensus_method, ages=None, half_life=recency_half_life):
+    if method == "median":
+        values = np.sort(values, axis=-1)  # NaN sorts last
+        count = np.sum(~np.isnan(values), axis=-1, keepdims=True)
+        low = np.take_along_axis(values, np.maximum(count - 1, 0) // 2, axis=-1)[..., 0]
+        high = np.take_along_axis(values, count // 2 - (count == 0), axis=-1)[..., 0]
+        return np.where(count[..., 0] > 0, (low + high) / 2, np.nan)
+    if method == "worst":
+        return np.fmin.reduce(values, axis=-1)  # fmin skips NaN; all-NaN gives NaN
+    if method == "recency":
+        weights = np.where(np.isnan(values), 0.0, 0.5 ** (np.nan_to_num(ages) / half_life))
+        total = weights.sum(axis=-1)
+        weighted = (weights * np.nan_to_num(values)).sum(axis=-1)
+        return np.divide(weighted, total, out=np.full(total.shape, np.nan), where=total > 0)
+    raise ValueError(f"Unknown consensus method {method!r}; expected one of {consensus_methods}")
+
+
+# Round consensus values onto the integer scale, halves down
+def to_scale(values):
+    return np.ceil(values - 0.5)
+
+
+# Per-agency panels: the last rating by each agency in each year, carried forward, and the year of
+# that agency's latest rating action, both (countries, years, agencies) with NaN before a first rating
+def agency_panel(ratings, scale, countries, years=years):
+    df = convert_ratings(ratings, scale)
+    df = df.assign(Year=df['Date'].dt.year)
+    df = df[df['Year'].between(years[0], years[-1])]
+    # Same-day ratings in reverse file order, as in build_panel
+    df = df.iloc[::-1].sort_values(by=['Country', 'Date'], kind='stable')
+    year_ratings = df.groupby(['Country', 'Agency', 'Year'], sort=False)['Scale'].last()
+    cells = pd.MultiIndex.from_product([countries, agencies, years], names=['Country', 'Agency', 'Year'])
+    values = year_ratings.reindex(cells).to_numpy(dtype=float).reshape(len(countries), len(agencies), len(years))
+
+    # Forward fill along the years: each cell reads the latest year with a rating action
+    year_index = np.arange(len(years))
+    latest = np.maximum.accumulate(np.where(np.isnan(values), 0, year_index), axis=-1)
+    values = np.take_along_axis(values, latest, axis=-1)
+    action_years = np.where(np.isnan(values), np.nan, np.asarray(years)[latest])
+    return values.transpose(0, 2, 1), action_years.transpose(0, 2, 1)
+
+
+# Long country-year table with each agency's rating and the consensus, typed for Parquet
+def consensus_table(values, action_years, countries, years=years, method=consensus_method, half_life=recency_half_life):
+    ages = np.asarray(years)[None, :, None] - action_years
+    consensus = to_scale(combine(values, method, ages, half_life))
+    table = pd.DataFrame({
+        'Country': pd.Categorical(np.repeat(countries, len(years)), categories=countries),
+        'Year': np.tile(np.asarray(years, dtype=np.int16), len(countries)),
+    })
+    for i, agency in enumerate(agencies):
+        table[agency] = pd.array(values[:, :, i].ravel(), dtype='Int8')
+    table['Consensus'] = pd.array(consensus.ravel(), dtype='Int8')
+    return table
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=log_level, format="%(levelname)s %(message)s")
+    ratings, countries = load_ratings(input_folder)
+    values, action_years = agency_panel(ratings, load_credit_scale(credit_scale_file), countries)
+    consensus_table(values, action_years, countries).to_parquet(output_file, index=False)
+    logger.info("%s consensus for %d countries saved to %s", consensus_method, len(countries), output_file)
@@ -1,82 +1,101 @@
+import concurrent.futures
+import logging
 import os
 import pandas as pd
-from datetime import datetime
 
 # Paths
 input_folder = "countries"  # Change this to your folder path
 credit_scale_file = "Credit Scale.csv"  # Change this to your file path
 output_file = "output.csv"
 
-# Load credit scale
-credit_scale_df = pd.read_csv(credit_scale_file)
-credit_scale = {}
-for agency in ['Moody\'s', 'S&P', 'DBRS']:
-    credit_scale[agency] = dict(zip(credit_scale_df[agency], credit_scale_df['Scale']))
+# Country files read at once (pandas' CSV parser releases the GIL, so threads overlap the reads)
+load_workers = 8
 
+# "DEBUG" also logs the first rows of every country file
+log_level = "INFO"
+
+logger = logging.getLogger("rating_csv")
+
+agencies = ['Moody\'s', 'S&P', 'DBRS']
 
 # Define the output structure
 years = list(range(1970, 2025))
-out_df = pd.DataFrame(columns=['Country'] + years)
-
-# Process each country's file
-for file in os.listdir(input_folder):
-    if file.endswith(".csv"):
-        country = file.replace(".csv", "")
-        file_path = os.path.join(input_folder, file)
-
-        # Load country data
-        try:
-            df = pd.read_csv(file_path, dayfirst=True)
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')  # Ensure proper date conversion
-            print(f"Successfully loaded {file}")
-            print(df.head())  # Debugging: Print first few rows to check data
-        except Exception as e:
-            print(f"Error loading {file}: {e}")
-            continue
-
-        df = df.dropna(subset=['Date'])  # Drop rows where date conversion failed
-        df = df.sort_values(by='Date', ascending=True)  # Process from earliest to latest
-
-
-        # Convert ratings to standard scale
-        def convert_rating(row):
-            agency = row['Agency']
-            rating = row['Rating']
-            scale = credit_scale.get(agency, {}).get(rating, None)
-            if scale is None:
-                print(f"Warning: No scale found for Rating: {rating}, Agency: {agency}")
-            return scale
-
-
-        df['Scale'] = df.apply(convert_rating, axis=1)
-        print("Converted ratings:")
-        print(df[['Rating', 'Agency', 'Scale']].head())  # Debugging: Check rating conversions
-        df.dropna(subset=['Scale'], inplace=True)
-
-        # Process ratings in chronological order
-        year_ratings = {}
-        last_value = None
-        for _, row in df.iterrows():
-            if pd.notna(row['Date']):
-                year = row['Date'].year
-                last_value = row['Scale']  # Update last known value
-                year_ratings[year] = last_value
-
-        # Fill in missing years by propagating values forward
-        country_ratings = {}
-        last_value = None
-        for year in years:
-            if year in year_ratings:
-                last_value = year_ratings[year]
-            country_ratings[year] = last_value
-
-        # Append to output DataFrame
-        new_row = pd.DataFrame([[country] + [country_ratings.get(y, '') for y in years]], columns=out_df.columns)
-        if not new_row.isna().all(axis=None):  # Ensure new_row is not entirely empty
-            out_df = pd.concat([out_df, new_row], ignore_index=True)
-
-        print(f"Finished processing {file}")
-
-# Save results
-out_df.to_csv(output_file, index=False)
-print(f"Processed data saved to {output_file}")
\ No newline at end of file
+
+
+# Credit scale as a long (Agency, Rating, Scale) table to merge ratings against
+def load_credit_scale(path):
+    credit_scale_df = pd.read_csv(path)
+    scale = credit_scale_df.melt(id_vars='Scale', value_vars=agencies, var_name='Agency', value_name='Rating')
+    # A rating listed twice for an agency takes the later row's scale
+    return scale.drop_duplicates(subset=['Agency', 'Rating'], keep='last')
+
+
+# One country's rating history (Agency, Rating, Outlook, Date), or None if the file can't be read
+def load_country(file_path):
+    try:
+        df = pd.read_csv(file_path, dayfirst=True)
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')  # Ensure proper date conversion
+    except Exception as e:
+        logger.error("Error loading %s: %s", os.path.basename(file_path), e)
+        return None
+    logger.debug("Loaded %s:\n%s", os.path.basename(file_path), df.head())
+    return df
+
+
+# Every country file in the folder as one long table with a Country column, plus the country names
+# in folder order (countries whose ratings all fail to convert still get an empty row). Files are
+# read by a thread pool and concatenated once.
+def load_ratings(folder, workers=load_workers):
+    files = [file for file in os.listdir(folder) if file.endswith(".csv")]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        loaded = list(executor.map(load_country, [os.path.join(folder, file) for file in files]))
+
+    frames, countries = [], []
+    for file, df in zip(files, loaded):
+        if df is not None:
+            countries.append(file.replace(".csv", ""))
+            frames.append(df.assign(Country=countries[-1]))
+    logger.info("Loaded %d of %d country files from %s", len(frames), len(files), folder)
+    ratings = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Country', 'Agency', 'Rating', 'Date'])
+    return ratings, countries
+
+
+# Dated ratings with a Scale column on the common scale, in their original order; ratings without
+# a date or a scale entry are dropped
+def convert_ratings(ratings, scale):
+    df = ratings.dropna(subset=['Date'])  # Drop rows where date conversion failed
+    df = df.merge(scale, on=['Agency', 'Rating'], how='left')
+    missing = df['Scale'].isna()
+    for (agency, rating), count in df[missing].groupby(['Agency', 'Rating'], dropna=False).size().items():
+        logger.warning("No scale found for Rating: %s, Agency: %s (%d ratings)", rating, agency, count)
+    return df[~missing]
+
+
+# Country x year panel of the last rating each year on the common scale, carried forward to later
+# years; years before a country's first rating stay empty. Ratings dated outside `years` are ignored.
+def build_panel(ratings, scale, countries, years=years):
+    df = convert_ratings(ratings, scale)
+
+    # Last rating of each year. Country files list the newest rating first, so ratings on the same
+    # day are taken in reverse file order: reversing before the stable sort puts the top one last.
+    df = df.assign(Year=df['Date'].dt.year)
+    df = df[df['Year'].between(years[0], years[-1])]
+    df = df.iloc[::-1].sort_values(by=['Country', 'Date'], kind='stable')
+    year_ratings = df.groupby(['Country', 'Year'], sort=False)['Scale'].last()
+
+    # Fill in missing years by propagating values forward
+    panel = year_ratings.unstack('Year').reindex(index=countries, columns=years).ffill(axis=1)
+    panel = panel.astype('Int64')
+    panel.index.name = 'Country'
+    panel.columns.name = None
+    return panel.reset_index()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=log_level, format="%(levelname)s %(message)s")
+    ratings, countries = load_ratings(input_folder)
+    out_df = build_panel(ratings, load_credit_scale(credit_scale_file), countries)
+
+    # Save results
+    out_df.to_csv(output_file, index=False)
+    logger.info("Processed data saved to %s", output_file)
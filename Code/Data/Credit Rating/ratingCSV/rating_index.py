@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from rating_consensus import combine, consensus_method, recency_half_life
+from rating_csv_v1 import agencies, convert_ratings
+
+# Point-in-time sovereign ratings at daily resolution. rating_csv_v1.py keeps one value per country
+# and year; here every rating stays in a sorted array keyed by (country, agency, day), so "rating
+# of country X on date D by agency A" is one np.searchsorted over all queries: the last rating
+# dated on or before D in X's segment for A. Ratings published the same day are ordered as in the
+# panel (the one listed first in the country file is in force). Consensus methods are those of
+# rating_consensus.py, over the agencies with a rating in force.
+#
+# Queries take arrays of country names (matched case-insensitively against the country files) and
+# dates; the result is a float array on the common scale with NaN where no rating was in force yet
+# or the country is unknown.
+
+# Days are stored relative to this date, leaving the low 32 bits of the sort key for the day
+epoch = np.datetime64('1800-01-01', 'D')
+
+
+class RatingIndex:
+    def __init__(self, ratings, scale):
+        df = convert_ratings(ratings, scale)
+        # Same-day ratings in reverse file order, so the one listed first sorts last (see build_panel)
+        df = df.iloc[::-1]
+        self.countries = pd.Index(sorted(df['Country'].str.lower().unique()))
+        country = self.countries.get_indexer(df['Country'].str.lower())
+        agency = pd.Index(agencies).get_indexer(df['Agency'])
+        days = (df['Date'].to_numpy().astype('datetime64[D]') - epoch).astype(np.int64)
+        keys = self.sort_key(country, agency, days)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.scales = df['Scale'].to_numpy(dtype=np.int8)[order]
+
+    @staticmethod
+    def sort_key(country, agency, days):
+        return ((country * len(agencies) + agency).astype(np.int64) << 32) | days
+
+    # Index of each query's country (-1 if unknown) and its day relative to the epoch
+    def query_positions(self, countries, dates):
+        # Lower-case each distinct name once rather than every query
+        codes, names = pd.factorize(np.asarray(countries, dtype=object).ravel())
+        country = self.countries.get_indexer(pd.Index(names).str.lower())[codes]
+        country[codes < 0] = -1  # Missing names
+        days = (pd.to_datetime(np.ravel(dates)).to_numpy().astype('datetime64[D]') - epoch).astype(np.int64)
+        return country, days
+
+    # Rating in force by one agency and the day it was published (NaN where there is none)
+    def lookup(self, country, days, agency):
+        known = (country >= 0) & (days >= 0)  # Unknown countries, missing dates (NaT) and dates before the epoch
+        keys = self.sort_key(np.where(known, country, 0), agencies.index(agency), np.where(known, days, 0))
+        position = np.maximum(np.searchsorted(self.keys, keys, side='right') - 1, 0)
+        # The rating found must belong to the same (country, agency) segment
+        found = known & (self.keys[position] >> 32 == keys >> 32) & (self.keys[position] <= keys)
+        return (np.where(found, self.scales[position], np.nan),
+                np.where(found, self.keys[position] & 0xFFFFFFFF, np.nan))
+
+    # Rating in force by one agency (name from `agencies`) on each date, for paired arrays of country
+    # names and dates
+    def rating(self, countries, dates, agency):
+        return self.lookup(*self.query_positions(countries, dates), agency)[0]
+
+    # Ratings in force by every agency, one column per entry of `agencies`
+    def agency_ratings(self, countries, dates):
+        country, days = self.query_positions(countries, dates)
+        return np.column_stack([self.lookup(country, days, agency)[0] for agency in agencies])
+
+    # Consensus of the agencies' ratings in force on each date (NaN where none has rated yet), by
+    # rating_consensus.combine: median, worst or recency (weighted by the age of each rating)
+    def consensus(self, countries, dates, method=consensus_method, half_life=recency_half_life):
+        country, days = self.query_positions(countries, dates)
+        values, published = zip(*[self.lookup(country, days, agency) for agency in agencies])
+        ages = (days[:, None] - np.column_stack(published)) / 365.25
+        return combine(np.column_stack(values), method, ages, half_life)
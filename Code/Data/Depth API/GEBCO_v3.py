@@ -0,0 +1,35 @@
+import pandas as pd
+import time
+
+from gebco_grid import load_depth_grid
+
+input_csv = 'RDS3CSVDepthExt2.csv'
+output_csv = 'outputRDS3Depth2.csv'
+
+# Local GEBCO bathymetry: the global NetCDF from https://www.gebco.net, or a raw int16 window cut
+# from it with gebco_grid.save_raw_grid (e.g. gebco_europe.int16 + gebco_europe.json)
+grid_file = 'gebco_europe.int16'
+
+# Open the grid memory-mapped; nothing is read until the lookup touches it
+grid = load_depth_grid(grid_file)
+
+# Read the input CSV
+df = pd.read_csv(input_csv)
+
+# One vectorized lookup for every row instead of one request per project
+start = time.perf_counter()
+df['Ocean Depth'] = grid.depth(df['Latitude'].to_numpy(), df['Longitude'].to_numpy()).round(2)
+elapsed = time.perf_counter() - start
+
+# Points outside the grid have no depth, as failed requests did in GEBCO_v2
+outside = df['Ocean Depth'].isna()
+if outside.any():
+    print(f"{outside.sum()} points are outside {grid_file}")
+
+output_df = df.loc[~outside, ['Entry ID', 'Latitude', 'Longitude', 'Ocean Depth']]
+
+# Save the DataFrame to the output CSV
+output_df.to_csv(output_csv, index=False)
+
+print(f"Looked up {len(df)} depths in {elapsed * 1000:.1f} ms")
+print(f"Results have been saved to {output_csv}")
@@ -0,0 +1,88 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import GEBCO_v2
+from check_grid_interpolation import check_depth_grid, check_depth_wrap
+from gebco_grid import load_depth_grid, make_synthetic_depth_grid, save_raw_grid
+from mock_servers import fake_depth, start_meteomatics_server
+
+# Offline check and benchmark of the memory-mapped GEBCO depth engine. The synthetic grid's
+# elevation is linear in row and column, so bilinear interpolation must reproduce it exactly
+# (check_grid_interpolation.py, run here on the in-memory and memory-mapped grids); the same points
+# are then timed through the grid and through GEBCO_v2's Meteomatics client against the local
+# stand-in, one point per request and batched (without the 50 requests per minute limiter).
+
+
+def random_points(grid, count, seed=0):
+    rng = np.random.default_rng(seed)
+    latitudes = rng.uniform(grid.lat_min, grid.lat_min + (grid.rows - 1) * grid.step, count)
+    longitudes = rng.uniform(grid.lon_min, grid.lon_min + (grid.cols - 1) * grid.step, count)
+    return latitudes, longitudes
+
+
+def check_grid(grid, label):
+    error = check_depth_grid(grid, label)
+    print(f"{label}: max interpolation error on 10,000 points {error:.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the GEBCO grid depth engine and compare it with per-point HTTP lookups.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6_000, 1_000_000])
+    parser.add_argument("--http-points", type=int, default=500, help="Points sent through the HTTP path")
+    parser.add_argument("--latency", type=float, default=0.01, help="Stand-in server latency per request in seconds")
+    parser.add_argument("--batch", type=int, default=200, help="Coordinates per batched request")
+    args = parser.parse_args()
+
+    grid = make_synthetic_depth_grid()
+    check_grid(grid, "in-memory grid")
+    check_depth_wrap()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Round trip through the raw int16 format and check the memory-mapped copy
+        raw_file = os.path.join(tmp, "synthetic.int16")
+        save_raw_grid(grid, raw_file)
+        mapped = load_depth_grid(raw_file)
+        assert isinstance(mapped.elevation, np.memmap)
+        check_grid(mapped, "memory-mapped grid")
+
+        # A cut-out window keeps its position
+        window_file = os.path.join(tmp, "window.int16")
+        save_raw_grid(mapped, window_file, lat_range=(50.0, 60.0), lon_range=(0.0, 10.0))
+        window = load_depth_grid(window_file)
+        latitudes, longitudes = np.array([52.3, 58.71]), np.array([1.1, 9.3])
+        assert np.allclose(window.depth(latitudes, longitudes), mapped.depth(latitudes, longitudes))
+
+        for count in args.sizes:
+            latitudes, longitudes = random_points(mapped, count)
+            start = time.perf_counter()
+            mapped.depth(latitudes, longitudes)
+            elapsed = time.perf_counter() - start
+            print(f"{'grid':<14} {count:>9,} points in {elapsed * 1000:9.1f} ms  ->  {count / elapsed:12,.0f} points/s")
+
+    server, url = start_meteomatics_server(latency=args.latency)
+    client = GEBCO_v2.client
+    client.base_url = url
+    client.limiter = None
+    latitudes, longitudes = random_points(grid, args.http_points)
+    for label, max_points in [("http per point", 1), ("http batched", args.batch)]:
+        client.max_points = max_points
+        requests_before = client.http.request_count
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            depths, failed = client.fetch(range(args.http_points), latitudes, longitudes)
+        elapsed = time.perf_counter() - start
+        assert not failed and np.allclose([depths[i] for i in range(args.http_points)],
+                                          [fake_depth(round(lat, 6), round(lon, 6)) for lat, lon in zip(latitudes, longitudes)])
+        request_count = client.http.request_count - requests_before
+        print(f"{label:<14} {args.http_points:>9,} points in {elapsed * 1000:9.1f} ms  ->  {args.http_points / elapsed:12,.0f} points/s "
+              f"({request_count} requests; {50 * max_points} points/min under the real 50 requests/min cap)")
+    server.shutdown()
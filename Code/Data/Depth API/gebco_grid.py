@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from grid_interpolation import array_corners, bilinear, open_netcdf
+
+# Offline ocean depth from a local GEBCO-style bathymetry grid. The elevation grid (metres, negative
+# below sea level) is opened memory-mapped, or lazily for NetCDF, so only the pages around the
+# queried points are ever read, and whole arrays of coordinates are answered in one vectorized
+# bilinear interpolation instead of one Meteomatics request each.
+#
+# Raw grids are a row-major int16 file (rows from south to north) next to a JSON header with the
+# grid size, the centre of the south-west cell and the cell size in degrees:
+#   gebco_europe.int16, gebco_europe.json -> {"rows": 9120, "cols": 16800, "lat_min": ..., "lon_min": ..., "step": ...}
+
+# GEBCO grids are 15 arc-second
+gebco_step = 1.0 / 240
+
+
+class DepthGrid:
+    def __init__(self, elevation, lat_min, lon_min, step):
+        self.elevation = elevation  # (rows, cols) array-like: ndarray, np.memmap or a lazy xarray DataArray
+        self.rows, self.cols = elevation.shape
+        self.lat_min = float(lat_min)
+        self.lon_min = float(lon_min)
+        self.step = float(step)
+        # Global grids continue across the antimeridian, so their last column neighbours the first
+        self.wraps = np.isclose(self.cols * self.step, 360.0)
+
+    # Bilinear interpolation of elevation in metres for arrays of coordinates (NaN outside the grid)
+    def elevation_at(self, latitudes, longitudes):
+        row = (np.asarray(latitudes, dtype=float) - self.lat_min) / self.step
+        col = (np.asarray(longitudes, dtype=float) - self.lon_min) / self.step
+        return bilinear(row, col, (self.rows, self.cols), self.read_corners, self.wraps)
+
+    # Positive depth in metres; land (elevation at or above sea level) is 0
+    def depth(self, latitudes, longitudes):
+        return np.maximum(-self.elevation_at(latitudes, longitudes), 0.0)
+
+    # The four corner elevations of every point's cell (grid_interpolation.bilinear corner reader)
+    def read_corners(self, inside, row0, col0, col1):
+        if isinstance(self.elevation, np.ndarray):
+            # np.memmap is an ndarray: fancy indexing only touches the pages holding these cells
+            return array_corners(self.elevation)(inside, row0, col0, col1)
+
+        # Lazy NetCDF variables: read the window covering the points once rather than the whole grid
+        # (a wrapped column pair spans the full width, so that case reads every column)
+        r0, r1 = row0.min(), row0.max() + 2
+        c0, c1 = min(col0.min(), col1.min()), max(col0.max(), col1.max()) + 1
+        window = np.asarray(self.elevation[r0:r1, c0:c1])
+        return array_corners(window)(inside, row0 - r0, col0 - c0, col1 - c0)
+
+
+def header_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+# Open a raw int16 grid memory-mapped (read only), or a GEBCO NetCDF file lazily
+def load_depth_grid(path, variable="elevation"):
+    if path.endswith(".nc"):
+        dataset = open_netcdf(path)
+        field = dataset[variable].transpose("lat", "lon")
+        latitudes = field["lat"].values
+        longitudes = field["lon"].values
+        return DepthGrid(field.variable, latitudes[0], longitudes[0], latitudes[1] - latitudes[0])
+
+    with open(header_path(path)) as f:
+        header = json.load(f)
+    elevation = np.memmap(path, dtype=np.int16, mode="r", shape=(header["rows"], header["cols"]))
+    return DepthGrid(elevation, header["lat_min"], header["lon_min"], header["step"])
+
+
+# Write a grid as raw int16 plus its JSON header, e.g. to cut a Europe window out of the global NetCDF
+def save_raw_grid(grid, path, lat_range=None, lon_range=None):
+    r0, r1, c0, c1 = 0, grid.rows, 0, grid.cols
+    if lat_range is not None:
+        r0 = max(0, int(np.floor((lat_range[0] - grid.lat_min) / grid.step)))
+        r1 = min(grid.rows, int(np.ceil((lat_range[1] - grid.lat_min) / grid.step)) + 1)
+    if lon_range is not None:
+        c0 = max(0, int(np.floor((lon_range[0] - grid.lon_min) / grid.step)))
+        c1 = min(grid.cols, int(np.ceil((lon_range[1] - grid.lon_min) / grid.step)) + 1)
+
+    output = np.memmap(path, dtype=np.int16, mode="w+", shape=(r1 - r0, c1 - c0))
+    # Copy in row bands so a global grid never has to fit in memory
+    for start in range(r0, r1, 1024):
+        end = min(start + 1024, r1)
+        output[start - r0:end - r0] = np.asarray(grid.elevation[start:end, c0:c1])
+    output.flush()
+    del output
+
+    with open(header_path(path), "w") as f:
+        json.dump({"rows": r1 - r0, "cols": c1 - c0, "lat_min": grid.lat_min + r0 * grid.step,
+                   "lon_min": grid.lon_min + c0 * grid.step, "step": grid.step}, f)
+
+
+# Synthetic grid whose elevation is linear in the row and column index (-10 m per row, -3 m per
+# column), so bilinear interpolation reproduces it exactly and depth = 10 * row + 3 * col
+def make_synthetic_depth_grid(lat_min=34.0, lon_min=-25.0, rows=760, cols=1400, step=0.05):
+    row = np.arange(rows, dtype=np.int32)[:, None]
+    col = np.arange(cols, dtype=np.int32)[None, :]
+    elevation = (-(10 * row + 3 * col)).astype(np.int16)
+    return DepthGrid(elevation, lat_min, lon_min, step)
+
+
+def synthetic_depth(grid, latitudes, longitudes):
+    return 10 * (np.asarray(latitudes) - grid.lat_min) / grid.step + 3 * (np.asarray(longitudes) - grid.lon_min) / grid.step
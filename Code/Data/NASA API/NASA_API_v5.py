@@ -1,6 +1,8 @@
 import requests
 import pandas as pd
 import time
+from bounded_cache import BoundedCache
+from wind_cache import grid_cell
 
 # Load data from CSV file
 input_file = "Europe Data Set/RDS3CSV.csv"
@@ -14,8 +16,8 @@ df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
 df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
 df["Start year"] = pd.to_numeric(df["Start year"], errors='coerce')
 
-# Filter out rows with NaN in the "Start year" column
-df = df.dropna(subset=["Start year"])
+# Filter out rows with NaN in the "Start year" column, or without coordinates to look up
+df = df.dropna(subset=["Start year", "Latitude", "Longitude"])
 
 # Base URL for the NASA POWER API
 base_url = "https://power.larc.nasa.gov/api/temporal/monthly/point"
@@ -23,10 +25,11 @@ base_url = "https://power.larc.nasa.gov/api/temporal/monthly/point"
 # Add a new column for the annual wind speed, initially set to None
 df["Annual Wind Speed"] = None
 
-# Cache for storing previous API results and counter for cache clearing
-cache = {}
+# Bounded LRU cache of annual wind speeds by POWER grid cell and year (every coordinate in a cell
+# gets the same values), and request counter. RDS3 needs 4,141 (cell, start year) entries, so
+# 10,000 (~2 MB) holds them all and only evicts on much larger inputs
+cache = BoundedCache(max_entries=10_000)
 request_count = 0
-clear_cache_threshold = 100  # Clear cache after every 100 requests
 
 # Batch processing parameters
 batch_size = 50
@@ -44,12 +47,13 @@ for batch_start in range(0, len(df), batch_size):
         latitude = row["Latitude"]
         longitude = row["Longitude"]
         start_year = int(row["Start year"])
-        location_key = (latitude, longitude, start_year)
+        location_key = (grid_cell(latitude, longitude), start_year)
 
         # Check if result is in cache
-        if location_key in cache:
+        cached_value = cache.get(location_key)
+        if cached_value is not None:
             print(f"Using cached data for entry {counter} with {latitude}, {longitude}, Year: {start_year}")
-            df.at[index, "Annual Wind Speed"] = cache[location_key]
+            df.at[index, "Annual Wind Speed"] = cached_value
             counter += 1
             continue
 
@@ -89,12 +93,6 @@ for batch_start in range(0, len(df), batch_size):
             print(f"Failed to retrieve data for {latitude}, {longitude}. Status code: {response.status_code}")
             df.at[index, "Annual Wind Speed"] = "None"
 
-        # Check if cache should be cleared
-        if request_count >= clear_cache_threshold:
-            print("Clearing cache to prevent memory overflow.")
-            cache.clear()
-            request_count = 0  # Reset the request count
-
         # Pause to avoid hitting API rate limits
         time.sleep(1)
 
@@ -102,4 +100,6 @@ for batch_start in range(0, len(df), batch_size):
     print(f"Saving batch {batch_start} to {batch_end} to {output_file}")
     df.iloc[batch_start:batch_end].to_csv(output_file, mode='a', index=False, header=(batch_start == 0))
 
+print(f"Cache: {cache.stats()}")
+print(f"API requests: {request_count}")
 print(f"All data saved to {output_file}")
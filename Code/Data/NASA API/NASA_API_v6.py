@@ -1,6 +1,8 @@
 import requests
 import pandas as pd
 import time
+from bounded_cache import BoundedCache
+from wind_cache import grid_cell
 
 # Load data from CSV file
 input_file = "Europe Data Set/RDS3CSV.csv"
@@ -14,8 +16,8 @@ df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
 df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
 df["Start year"] = pd.to_numeric(df["Start year"], errors='coerce')
 
-# Filter out rows with NaN in the "Start year" column
-df = df.dropna(subset=["Start year"])
+# Filter out rows with NaN in the "Start year" column, or without coordinates to look up
+df = df.dropna(subset=["Start year", "Latitude", "Longitude"])
 
 # Base URL for the NASA POWER API
 base_url = "https://power.larc.nasa.gov/api/temporal/monthly/point"
@@ -23,10 +25,12 @@ base_url = "https://power.larc.nasa.gov/api/temporal/monthly/point"
 # Add a new column for the average wind speed, initially set to None
 df["Average Wind Speed"] = None
 
-# Cache for storing previous API results and counter for cache clearing
-cache = {}
+# Bounded LRU cache of annual wind speeds by POWER grid cell and year (every coordinate in a cell
+# gets the same values, and neighbouring start years share years), and request counter. RDS3
+# needs 8,848 (cell, year) entries, so 10,000 (~2 MB) holds them all and only evicts on much
+# larger inputs
+cache = BoundedCache(max_entries=10_000)
 request_count = 0
-clear_cache_threshold = 100  # Clear cache after every 100 requests
 
 # Batch processing parameters
 batch_size = 50
@@ -45,14 +49,7 @@ for batch_start in range(0, len(df), batch_size):
         latitude = row["Latitude"]
         longitude = row["Longitude"]
         start_year = int(row["Start year"])
-        location_key = (latitude, longitude, start_year)
-
-        # Check if result is in cache
-        if location_key in cache:
-            print(f"Using cached data for entry {entry_id} with {latitude}, {longitude}, Year: {start_year}")
-            df.at[index, "Average Wind Speed"] = cache[location_key]
-            counter += 1
-            continue
+        cell = grid_cell(latitude, longitude)
 
         print(f"Processing entry {entry_id} with {latitude}, {longitude}, Year: {start_year}")
         counter += 1
@@ -67,6 +64,13 @@ for batch_start in range(0, len(df), batch_size):
         wind_speeds = []
 
         for year in years_to_check:
+            # Check if result is in cache
+            cached_value = cache.get((cell, year))
+            if cached_value is not None:
+                print(f"Using cached data for {latitude}, {longitude} in {year}")
+                wind_speeds.append(cached_value)
+                continue
+
             # Define the parameters for the API request
             params = {
                 "start": year,
@@ -91,6 +95,7 @@ for batch_start in range(0, len(df), batch_size):
 
                 if wind_speed is not None:
                     wind_speeds.append(wind_speed)
+                    cache[(cell, year)] = wind_speed  # Store in cache
             else:
                 print(f"Failed to retrieve data for {latitude}, {longitude} in {year}. Status code: {response.status_code}")
 
@@ -102,20 +107,15 @@ for batch_start in range(0, len(df), batch_size):
             average_wind_speed = sum(wind_speeds) / len(wind_speeds)
             df.at[index, "Average Wind Speed"] = average_wind_speed
             print(f"Average Wind Speed: {average_wind_speed}")
-            cache[location_key] = average_wind_speed  # Store in cache
         else:
             print(f"No valid wind speed data for {latitude}, {longitude} around {start_year}")
             df.at[index, "Average Wind Speed"] = "None"
 
-        # Check if cache should be cleared
-        if request_count >= clear_cache_threshold:
-            print("Clearing cache to prevent memory overflow.")
-            cache.clear()
-            request_count = 0  # Reset the request count
-
     # After processing each batch, save only the required columns to the output CSV
     print(f"Saving batch {batch_start} to {batch_end} to {output_file}")
     columns_to_save = ["Entry ID", "Longitude", "Latitude", "Start year", "Average Wind Speed"]
     df.iloc[batch_start:batch_end][columns_to_save].to_csv(output_file, mode='a', index=False, header=(batch_start == 0))
 
+print(f"Cache: {cache.stats()}")
+print(f"API requests: {request_count}")
 print(f"All data saved to {output_file}")
\ No newline at end of file
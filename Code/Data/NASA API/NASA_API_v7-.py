@@ -2,6 +2,8 @@ import requests
 import pandas as pd
 import time
 import os
+from bounded_cache import BoundedCache
+from wind_cache import grid_cell
 
 # File paths
 input_file = "Europe Data Set/greece.csv"
@@ -14,6 +16,9 @@ df = pd.read_csv(input_file)
 df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
 df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
 
+# Filter out rows without coordinates to look up
+df = df.dropna(subset=["Latitude", "Longitude"])
+
 # Check the output file to determine where to resume
 processed_ids = set()
 if os.path.exists(output_file):
@@ -25,10 +30,11 @@ if os.path.exists(output_file):
 # Base URL for the NASA POWER API
 base_url = "https://power.larc.nasa.gov/api/temporal/monthly/point"
 
-# Cache for storing previous API results and counter for cache clearing
-cache = {}
+# Bounded LRU cache of 2000-2022 average wind speeds by POWER grid cell (every coordinate in a
+# cell gets the same values), and request counter. Europe has ~8,700 cells, so 10,000 (~2 MB)
+# never evicts within the region
+cache = BoundedCache(max_entries=10_000)
 request_count = 0
-clear_cache_threshold = 100  # Clear cache after every 100 requests
 
 # Batch processing parameters
 batch_size = 5
@@ -53,12 +59,13 @@ for batch_start in range(0, len(df), batch_size):
 
         latitude = row["Latitude"]
         longitude = row["Longitude"]
-        location_key = (latitude, longitude)
+        location_key = grid_cell(latitude, longitude)
 
         # Check if result is in cache
-        if location_key in cache:
+        cached_value = cache.get(location_key)
+        if cached_value is not None:
             print(f"Using cached data for entry {entry_id} with {latitude}, {longitude}")
-            average_wind_speed = cache[location_key]
+            average_wind_speed = cached_value
         else:
             print(f"Processing entry {entry_id} with {latitude}, {longitude}")
 
@@ -120,12 +127,6 @@ for batch_start in range(0, len(df), batch_size):
 
         counter += 1
 
-        # Check if cache should be cleared
-        if request_count >= clear_cache_threshold:
-            print("Clearing cache to prevent memory overflow.")
-            cache.clear()
-            request_count = 0  # Reset the request count
-
     # Save the current batch to the output CSV
     if output_batch:
         save_mode = 'a' if os.path.exists(output_file) else 'w'
@@ -134,4 +135,6 @@ for batch_start in range(0, len(df), batch_size):
         print(f"Saved batch {batch_start} to {batch_end} to {output_file}")
         output_batch = []  # Clear the batch after saving
 
+print(f"Cache: {cache.stats()}")
+print(f"API requests: {request_count}")
 print(f"All data saved to {output_file}")
\ No newline at end of file
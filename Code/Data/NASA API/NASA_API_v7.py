@@ -2,6 +2,13 @@ import requests
 import pandas as pd
 import time
 import os
+import sys
+from bounded_cache import BoundedCache
+from wind_cache import grid_cell
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from http_client import PooledClient
 
 # File paths
 input_file = "Europe Data Set/RDS3CSV.csv"
@@ -15,8 +22,8 @@ df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
 df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
 df["Start year"] = pd.to_numeric(df["Start year"], errors='coerce')
 
-# Filter out rows with NaN in the "Start year" column
-df = df.dropna(subset=["Start year"])
+# Filter out rows with NaN in the "Start year" column, or without coordinates to look up
+df = df.dropna(subset=["Start year", "Latitude", "Longitude"])
 
 # Check the output file to determine where to resume
 processed_ids = set()
@@ -29,10 +36,15 @@ if os.path.exists(output_file):
 # Base URL for the NASA POWER API
 base_url = "https://power.larc.nasa.gov/api/temporal/monthly/point"
 
-# Cache for storing previous API results and counter for cache clearing
-cache = {}
+# Pooled keep-alive HTTP client, one request at a time as before
+http = PooledClient(timeout=60, max_per_host=1)
+
+# Bounded LRU cache of annual wind speeds by POWER grid cell and year (every coordinate in a cell
+# gets the same values, and neighbouring start years share years), and request counter. RDS3
+# needs 8,848 (cell, year) entries, so 10,000 (~2 MB) holds them all and only evicts on much
+# larger inputs
+cache = BoundedCache(max_entries=10_000)
 request_count = 0
-clear_cache_threshold = 100  # Clear cache after every 100 requests
 
 # Batch processing parameters
 batch_size = 50
@@ -58,65 +70,72 @@ for batch_start in range(0, len(df), batch_size):
         latitude = row["Latitude"]
         longitude = row["Longitude"]
         start_year = int(row["Start year"])
-        location_key = (latitude, longitude, start_year)
+        cell = grid_cell(latitude, longitude)
 
-        # Check if result is in cache
-        if location_key in cache:
-            print(f"Using cached data for entry {entry_id} with {latitude}, {longitude}, Year: {start_year}")
-            average_wind_speed = cache[location_key]
-        else:
-            print(f"Processing entry {entry_id} with {latitude}, {longitude}, Year: {start_year}")
+        print(f"Processing entry {entry_id} with {latitude}, {longitude}, Year: {start_year}")
 
-            # Determine the years to request
-            if start_year == '-':
-                years_to_check = list(range(2000, 2023))
-            elif start_year > 2022:
-                years_to_check = [2022]  # Use only 2022 if the year is beyond the API's range
-            else:
-                years_to_check = [year for year in range(start_year - 1, start_year + 2) if year <= 2022]
-
-            # Initialize wind speed list for averaging
-            wind_speeds = []
-
-            for year in years_to_check:
-                # Define the parameters for the API request
-                params = {
-                    "start": year,
-                    "end": year,
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "community": "ag",
-                    "parameters": "WS50M",
-                    "format": "json",
-                    "header": "true"
-                }
-
-                # Make the API request
-                response = requests.get(base_url, params=params)
-                request_count += 1  # Increment request count
-
-                if response.status_code == 200:
-                    data = response.json()
-                    wind_data = data["properties"]["parameter"]["WS50M"]
-                    annual_key = f"{year}13"
-                    wind_speed = wind_data.get(annual_key, None)
-
-                    if wind_speed is not None:
-                        wind_speeds.append(wind_speed)
-                else:
-                    print(f"Failed to retrieve data for {latitude}, {longitude} in {year}. Status code: {response.status_code}")
-
-                # Pause to avoid hitting API rate limits
+        # Determine the years to request
+        if start_year == '-':
+            years_to_check = list(range(2000, 2023))
+        elif start_year > 2022:
+            years_to_check = [2022]  # Use only 2022 if the year is beyond the API's range
+        else:
+            years_to_check = [year for year in range(start_year - 1, start_year + 2) if year <= 2022]
+
+        # Initialize wind speed list for averaging
+        wind_speeds = []
+
+        for year in years_to_check:
+            # Check if result is in cache
+            cached_value = cache.get((cell, year))
+            if cached_value is not None:
+                print(f"Using cached data for {latitude}, {longitude} in {year}")
+                wind_speeds.append(cached_value)
+                continue
+
+            # Define the parameters for the API request
+            params = {
+                "start": year,
+                "end": year,
+                "latitude": latitude,
+                "longitude": longitude,
+                "community": "ag",
+                "parameters": "WS50M",
+                "format": "json",
+                "header": "true"
+            }
+
+            # Make the API request
+            try:
+                response = http.get(base_url, params=params)
+            except requests.RequestException as e:
+                print(f"Failed to retrieve data for {latitude}, {longitude} in {year}: {e}")
                 time.sleep(1)
-
-            # Calculate the average wind speed
-            if wind_speeds:
-                average_wind_speed = sum(wind_speeds) / len(wind_speeds)
-                cache[location_key] = average_wind_speed  # Store in cache
-                print(f"Average Wind Speed: {average_wind_speed}")
+                continue
+            request_count += 1  # Increment request count
+
+            if response.status_code == 200:
+                data = response.json()
+                wind_data = data["properties"]["parameter"]["WS50M"]
+                annual_key = f"{year}13"
+                wind_speed = wind_data.get(annual_key, None)
+
+                if wind_speed is not None:
+                    wind_speeds.append(wind_speed)
+                    cache[(cell, year)] = wind_speed  # Store in cache
             else:
-                print(f"No valid wind speed data for {latitude}, {longitude} around {start_year}")
-                average_wind_speed = None
+                print(f"Failed to retrieve data for {latitude}, {longitude} in {year}. Status code: {response.status_code}")
+
+            # Pause to avoid hitting API rate limits
+            time.sleep(1)
+
+        # Calculate the average wind speed
+        if wind_speeds:
+            average_wind_speed = sum(wind_speeds) / len(wind_speeds)
+            print(f"Average Wind Speed: {average_wind_speed}")
+        else:
+            print(f"No valid wind speed data for {latitude}, {longitude} around {start_year}")
+            average_wind_speed = None
 
         # Append the processed row to the output batch
         output_batch.append({
@@ -129,12 +148,6 @@ for batch_start in range(0, len(df), batch_size):
 
         counter += 1
 
-        # Check if cache should be cleared
-        if request_count >= clear_cache_threshold:
-            print("Clearing cache to prevent memory overflow.")
-            cache.clear()
-            request_count = 0  # Reset the request count
-
     # Save the current batch to the output CSV
     if output_batch:
         save_mode = 'a' if os.path.exists(output_file) else 'w'
@@ -143,4 +156,7 @@ for batch_start in range(0, len(df), batch_size):
         print(f"Saved batch {batch_start} to {batch_end} to {output_file}")
         output_batch = []  # Clear the batch after saving
 
+print(f"Cache: {cache.stats()}")
+print(f"API requests: {request_count}")
+print(f"HTTP: {http.stats()}")
 print(f"All data saved to {output_file}")
\ No newline at end of file
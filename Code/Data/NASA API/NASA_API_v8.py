@@ -0,0 +1,425 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from climatology_store import ClimatologyStore, derive_features, parameters, parse_power_response
+from http_client import LatencyHistogram
+from resilience import CircuitBreaker, FailureLedger, RetryPolicy
+from resume_index import ResumeIndex
+from wind_cache import WindSpeedCache, cell_centre, grid_cell
+from wind_grid import download_grid, load_grid
+
+# File paths
+input_file = "Europe Data Set/RDS3CSV.csv"
+output_file = "outputRDS3.csv"
+
+# Base URL for the NASA POWER API
+base_url = "https://power.larc.nasa.gov/api/temporal/monthly/point"
+
+# Persistent per grid cell wind speed cache, shared across runs and dataset revisions
+cache_file = "wind_speed_cache.sqlite"
+
+# Monthly multi-parameter climatology store (Parquet parts), filled by every request
+store_path = "wind_climatology"
+
+# Concurrency and rate limit settings (replace the fixed time.sleep(1) per request)
+max_in_flight = 8  # Number of requests kept in flight at once
+requests_per_second = 5.0  # Sustained request budget for the token bucket
+burst_size = 5  # Requests allowed back to back before the budget applies
+
+# Retry and circuit breaker settings for 429/5xx responses and network errors
+max_attempts = 5
+retry_base_delay = 0.5  # Seconds, doubled on every attempt with full jitter
+retry_max_delay = 30.0
+breaker_threshold = 5  # Consecutive failures before a host's circuit opens
+breaker_reset_seconds = 10.0
+
+# Batch processing parameters
+batch_size = 50
+chunk_size = 1000  # Input rows read from the CSV at a time
+
+
+# Token bucket limiter: refills at `rate` tokens per second up to `capacity`
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return  # No budget configured, requests are only limited by max_in_flight
+
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# Determine the years to request around a project's start year
+def years_to_check(start_year):
+    if start_year > 2022:
+        return [2022]  # Use only 2022 if the year is beyond the API's range
+    return [year for year in range(start_year - 1, start_year + 2) if year <= 2022]
+
+
+# Plan one ranged request per POWER grid cell covering every year any project in it needs
+def plan_requests(df):
+    plan = {}
+    for latitude, longitude, start_year in zip(df["Latitude"], df["Longitude"], df["Start year"]):
+        cell = grid_cell(latitude, longitude)
+        if cell not in plan:
+            plan[cell] = [set(), 0]
+        plan[cell][0].update(years_to_check(int(start_year)))
+        plan[cell][1] += 1
+    return plan
+
+
+# True when a POWER response carries the WS50M values the fetcher reads
+def has_wind_data(data):
+    try:
+        return isinstance(data["properties"]["parameter"]["WS50M"], dict)
+    except (KeyError, TypeError):
+        return False
+
+
+class PowerFetcher:
+    def __init__(self, session, url, plan, cache, store, ledger, retry, max_in_flight, requests_per_second, burst_size):
+        self.session = session
+        self.url = url
+        self.plan = plan  # grid cell -> [years needed, projects still to write]
+        self.cache = cache  # persistent {cell, year} -> WS50M store shared across runs
+        self.store = store  # monthly multi-parameter climatology store, or None
+        self.ledger = ledger  # persisted (entry, year, status) rows for entries that failed
+        self.retry = retry
+        self.parameter_names = store.parameter_names if store is not None else ["WS50M"]
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.limiter = TokenBucket(requests_per_second, burst_size)
+        self.breakers = {}  # host -> CircuitBreaker
+        self.cells = {}  # grid cell -> task resolving to ({year: annual WS50M}, failure status or None)
+        self.total_requests = 0
+        self.latencies = LatencyHistogram()  # Seconds per request, for tail latency reporting
+        self.retries = 0
+        self.failed_entries = 0
+
+    # Fetch every configured parameter for one location over a range of years.
+    # Returns (response data, None) on success or (None, last status) once retries are exhausted.
+    async def fetch_location(self, latitude, longitude, first_year, last_year):
+        params = {
+            "start": first_year,
+            "end": last_year,
+            "latitude": latitude,
+            "longitude": longitude,
+            "community": "ag",
+            "parameters": ",".join(self.parameter_names),
+            "format": "json",
+            "header": "true"
+        }
+        params = {key: str(value) for key, value in params.items()}
+
+        host = urlparse(self.url).netloc
+        breaker = self.breakers.setdefault(host, CircuitBreaker(breaker_threshold, breaker_reset_seconds))
+        status = None
+        retry_after = None
+        for attempt in range(self.retry.max_attempts):
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(self.retry.delay(attempt, retry_after))
+            await breaker.before_request()
+
+            async with self.semaphore:
+                await self.limiter.acquire()
+                self.total_requests += 1
+                retry_after = None
+                start = time.perf_counter()
+                try:
+                    async with self.session.get(self.url, params=params) as response:
+                        if response.status == 200:
+                            # A 200 with an error page or a truncated body is a failed request too
+                            data = await response.json(content_type=None)
+                            if has_wind_data(data):
+                                breaker.record_success()
+                                return data, None
+                            status = "missing_WS50M"
+                        else:
+                            status = response.status
+                            retry_after = response.headers.get("Retry-After")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    status = type(e).__name__
+                except ValueError:
+                    status = "bad_json"
+                finally:
+                    self.latencies.record(time.perf_counter() - start)
+
+            print(f"Failed to retrieve data for {latitude}, {longitude} in {first_year}-{last_year} "
+                  f"(attempt {attempt + 1} of {self.retry.max_attempts}). Status: {status}")
+            if not self.retry.should_retry(status):
+                breaker.record_success()  # The host answered; the request itself is at fault
+                break
+            breaker.record_failure()
+
+        return None, status
+
+    # Serve a cell's years from the persistent cache, fetching only the years it is missing
+    async def fetch_cell(self, cell):
+        years = self.plan[cell][0]
+        annual_values = self.cache.get(cell, years)
+        missing_years = [year for year in years if year not in annual_values]
+        if not missing_years:
+            return annual_values, None
+
+        latitude, longitude = cell_centre(cell)
+        first_year, last_year = min(missing_years), max(missing_years)
+        data, status = await self.fetch_location(latitude, longitude, first_year, last_year)
+        if data is None:
+            return annual_values, status
+
+        # Every month of every parameter goes to the climatology store
+        if self.store is not None:
+            self.store.add(parse_power_response(data, cell, self.parameter_names))
+
+        # Annual WS50M values are stored under the "{year}13" keys, -999 marks missing data
+        wind_data = data["properties"]["parameter"]["WS50M"]
+        fetched = {year: wind_data.get(f"{year}13", None) for year in range(first_year, last_year + 1)}
+        fetched = {year: value for year, value in fetched.items() if value is not None and value != -999}
+        self.cache.put(cell, fetched)
+        annual_values.update(fetched)
+        return annual_values, None
+
+    async def process_entry(self, entry_id, latitude, longitude, start_year):
+        cell = grid_cell(latitude, longitude)
+
+        # Start the cell's lookup the first time any project in it needs it
+        if cell not in self.cells:
+            print(f"Processing grid cell {cell_centre(cell)} for entry {entry_id}")
+            self.cells[cell] = asyncio.ensure_future(self.fetch_cell(cell))
+        else:
+            print(f"Using grid cell data for entry {entry_id} with {latitude}, {longitude}, Year: {start_year}")
+
+        annual_values, status = await self.cells[cell]
+
+        # Entries whose years could not be fetched go to the failure ledger instead of the output,
+        # so a rerun or --replay-failures fills them in rather than leaving None behind
+        years = years_to_check(start_year)
+        if status is not None:
+            failed_years = [year for year in years if year not in annual_values]
+            if failed_years:
+                self.ledger.record(entry_id, latitude, longitude, start_year, failed_years, status)
+                self.failed_entries += 1
+                self.release(cell)
+                return None
+
+        # Fan the annual values back out to this project's years
+        wind_speeds = [annual_values.get(year) for year in years]
+        wind_speeds = [wind_speed for wind_speed in wind_speeds if wind_speed is not None]
+        if wind_speeds:
+            average_wind_speed = sum(wind_speeds) / len(wind_speeds)
+            print(f"Average Wind Speed for entry {entry_id}: {average_wind_speed}")
+        else:
+            print(f"No valid wind speed data for {latitude}, {longitude} around {start_year}")
+            average_wind_speed = None
+
+        self.release(cell)
+        return {
+            "Entry ID": entry_id,
+            "Longitude": longitude,
+            "Latitude": latitude,
+            "Start year": start_year,
+            "Average Wind Speed": average_wind_speed
+        }
+
+    # Drop a cell's values from memory once every planned project in it has been written
+    def release(self, cell):
+        self.plan[cell][1] -= 1
+        if self.plan[cell][1] == 0:
+            del self.plan[cell]
+            self.cells.pop(cell, None)
+
+
+# Stream the input CSV in chunks with the relevant columns coerced to numbers
+def read_input_chunks(input_file, chunk_size):
+    for chunk in pd.read_csv(input_file, chunksize=chunk_size):
+        chunk["Latitude"] = pd.to_numeric(chunk["Latitude"], errors='coerce')
+        chunk["Longitude"] = pd.to_numeric(chunk["Longitude"], errors='coerce')
+        chunk["Start year"] = pd.to_numeric(chunk["Start year"], errors='coerce')
+
+        # Filter out rows with NaN in the "Start year" column
+        yield chunk.dropna(subset=["Start year"])
+
+
+# Open the Entry ID checkpoint next to the output. Deleting the output starts over (as in v7), so a
+# leftover checkpoint is discarded; otherwise it is checked against the output's Entry IDs.
+def open_resume_index(output_file):
+    resume = ResumeIndex(output_file + ".done")
+    if not os.path.exists(output_file):
+        if resume.exists():
+            print(f"{output_file} not found, discarding resume index {resume.path}")
+            resume.discard()
+    elif resume.sync_with_output(output_file):
+        print(f"Rebuilt resume index from {output_file}")
+    if resume.count():
+        print(f"Resuming from {resume.count()} processed entries.")
+    return resume
+
+
+def save_batch(output_batch, output_file, resume):
+    save_mode = 'a' if os.path.exists(output_file) else 'w'
+    output_df = pd.DataFrame(output_batch)
+    output_df.to_csv(output_file, mode=save_mode, index=False, header=(save_mode == 'w'))
+    resume.mark(output_df["Entry ID"])
+
+
+# Process a frame of pending entries in batches, keeping up to max_in_flight requests running
+async def process_pending(fetcher, pending, output_file, resume, store, label):
+    # Entries without usable coordinates can't be snapped to a grid cell; they go to the failure
+    # ledger (and are picked up again once the input is fixed) instead of aborting the run
+    valid = np.isfinite(pending["Latitude"].to_numpy(dtype=float)) & np.isfinite(pending["Longitude"].to_numpy(dtype=float))
+    invalid = pending[~valid]
+    for entry_id, latitude, longitude, start_year in zip(invalid["Entry ID"], invalid["Latitude"], invalid["Longitude"], invalid["Start year"]):
+        print(f"Failed to retrieve data for entry {entry_id}. Invalid coordinates: {latitude}, {longitude}")
+        fetcher.ledger.record(entry_id, latitude, longitude, int(start_year), years_to_check(int(start_year)), "invalid coordinates")
+        fetcher.failed_entries += 1
+    fetcher.ledger.flush()
+    pending = pending[valid]
+
+    # Plan the coalesced requests for the pending entries
+    fetcher.plan = plan_requests(pending)
+    print(f"Planned {len(fetcher.plan)} grid cells for {len(pending)} entries in {label}.")
+
+    # Every entry is started up front (requests are still bounded by max_in_flight), so a slow
+    # retry in one batch doesn't hold back the fetches for the batches after it
+    tasks = [
+        asyncio.ensure_future(fetcher.process_entry(entry_id, latitude, longitude, int(start_year)))
+        for entry_id, latitude, longitude, start_year
+        in zip(pending["Entry ID"], pending["Latitude"], pending["Longitude"], pending["Start year"])
+    ]
+
+    # Batches are saved in input order, matching the sequential script's CSV
+    for batch_start in range(0, len(tasks), batch_size):
+        output_batch = [row for row in await asyncio.gather(*tasks[batch_start:batch_start + batch_size]) if row is not None]
+        if output_batch:
+            save_batch(output_batch, output_file, resume)
+            print(f"Saved {len(output_batch)} entries of {label} to {output_file}")
+        fetcher.ledger.flush()
+        if store is not None:
+            store.flush()
+
+
+async def run(input_file, output_file, url=base_url, max_in_flight=max_in_flight,
+              requests_per_second=requests_per_second, burst_size=burst_size, cache_file=cache_file,
+              store_path=store_path, parameter_names=parameters, chunk_size=chunk_size,
+              retry=None, replay_failures=False):
+    resume = open_resume_index(output_file)
+    cache = WindSpeedCache(cache_file)
+    store = ClimatologyStore(store_path, parameter_names) if store_path else None
+    ledger = FailureLedger(output_file + ".failures.csv")
+    retry = retry or RetryPolicy(max_attempts, retry_base_delay, retry_max_delay)
+
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        fetcher = PowerFetcher(session, url, {}, cache, store, ledger, retry, max_in_flight, requests_per_second, burst_size)
+
+        if replay_failures:
+            # Re-drive only the ledger's entries; the ledger itself carries their coordinates
+            failures = ledger.start_replay()
+            pending = failures.drop_duplicates(subset=["Entry ID"])
+            pending = pending[~resume.contains(pending["Entry ID"])]
+            print(f"Replaying {len(pending)} failed entries from {ledger.path}")
+            await process_pending(fetcher, pending, output_file, resume, store, "failure replay")
+            ledger.finish_replay()
+        else:
+            # Only one chunk is held in memory at a time; the cache carries grid cells across chunks
+            for chunk_number, chunk in enumerate(read_input_chunks(input_file, chunk_size)):
+                pending = chunk[~resume.contains(chunk["Entry ID"])]
+                if len(pending) < len(chunk):
+                    print(f"Skipping {len(chunk) - len(pending)} already processed entries in chunk {chunk_number}.")
+                await process_pending(fetcher, pending, output_file, resume, store, f"chunk {chunk_number}")
+
+    print(f"Wind speed cache: {cache.hits} hits, {cache.misses} misses ({cache.hit_rate():.1%} hit rate)")
+    cache.close()
+    if store is not None:
+        store.compact()
+        print(f"Climatology store: {len(store.stored)} grid cell years in {store.path}")
+    print(f"{fetcher.total_requests} requests, {fetcher.retries} retries, {fetcher.failed_entries} entries recorded in {ledger.path}")
+    print(f"Request latency p50 {fetcher.latencies.percentile(50) * 1000:.1f} ms, p99 {fetcher.latencies.percentile(99) * 1000:.1f} ms")
+    print(f"All data saved to {output_file}")
+    return fetcher
+
+
+# Bulk-grid mode: answer every pending project from a local gridded WS50M file with no API calls
+def run_grid(input_file, output_file, grid_file, chunk_size=100_000):
+    resume = open_resume_index(output_file)
+    grid = load_grid(grid_file)
+    print(f"Loaded {len(grid.years)} years of a {len(grid.latitudes)} x {len(grid.longitudes)} grid from {grid_file}")
+
+    for chunk in read_input_chunks(input_file, chunk_size):
+        pending = chunk[~resume.contains(chunk["Entry ID"])]
+        if pending.empty:
+            continue
+
+        # One array operation for every project in the chunk
+        start_years = pending["Start year"].astype(int).to_numpy()
+        average_wind_speed = grid.average_wind_speed(pending["Latitude"].to_numpy(), pending["Longitude"].to_numpy(), start_years)
+
+        output_df = pd.DataFrame({
+            "Entry ID": pending["Entry ID"].to_numpy(),
+            "Longitude": pending["Longitude"].to_numpy(),
+            "Latitude": pending["Latitude"].to_numpy(),
+            "Start year": start_years,
+            "Average Wind Speed": average_wind_speed
+        })
+        save_batch(output_df, output_file, resume)
+        print(f"Saved {len(output_df)} entries ({output_df['Average Wind Speed'].isna().sum()} without grid data) to {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch average NASA POWER wind speeds with concurrent, rate limited, coalesced requests.")
+    parser.add_argument("--input", default=input_file)
+    parser.add_argument("--output", default=output_file)
+    parser.add_argument("--url", default=base_url)
+    parser.add_argument("--max-in-flight", type=int, default=max_in_flight)
+    parser.add_argument("--rps", type=float, default=requests_per_second, help="Requests per second budget (0 disables the limiter)")
+    parser.add_argument("--burst", type=int, default=burst_size)
+    parser.add_argument("--cache", default=cache_file, help="SQLite file holding per grid cell annual wind speeds")
+    parser.add_argument("--store", default=store_path, help="Directory of the monthly climatology Parquet store (empty string disables it)")
+    parser.add_argument("--parameters", default=",".join(parameters), help="Comma separated POWER parameters to request (must include WS50M)")
+    parser.add_argument("--chunk-size", type=int, default=chunk_size, help="Input rows held in memory at a time")
+    parser.add_argument("--max-attempts", type=int, default=max_attempts, help="Attempts per request before it goes to the failure ledger")
+    parser.add_argument("--replay-failures", action="store_true", help="Re-drive only the entries in the failure ledger")
+    parser.add_argument("--grid-file", help="Interpolate from a local gridded WS50M file (CSV or NetCDF) instead of point requests")
+    parser.add_argument("--download-grid", metavar="PATH", help="Download the Europe WS50M grid for 1999-2022 to a CSV file and exit")
+    parser.add_argument("--features", metavar="PATH", help="Write per grid cell and year features derived from the climatology store to a CSV file and exit")
+    args = parser.parse_args()
+
+    if args.features:
+        store = ClimatologyStore(args.store, args.parameters.split(","))
+        features = derive_features(store.load())
+        features.to_csv(args.features, index=False)
+        print(f"{len(features)} grid cell years of derived features saved to {args.features}")
+    elif args.download_grid:
+        download_grid(list(range(1999, 2023))).to_csv(args.download_grid, index=False)
+        print(f"Grid saved to {args.download_grid}")
+    elif args.grid_file:
+        run_grid(args.input, args.output, args.grid_file, args.chunk_size)
+    else:
+        asyncio.run(run(args.input, args.output, args.url, args.max_in_flight, args.rps, args.burst, args.cache,
+                        args.store, args.parameters.split(","), args.chunk_size,
+                        RetryPolicy(args.max_attempts, retry_base_delay, retry_max_delay), args.replay_failures))
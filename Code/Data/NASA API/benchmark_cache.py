@@ -0,0 +1,92 @@
+import argparse
+
+import pandas as pd
+
+from bounded_cache import BoundedCache
+from NASA_API_v8 import years_to_check
+from wind_cache import grid_cell
+
+# Replays the real RDS coordinate sequence through the NASA_API_v7 caching logic and counts the
+# API requests issued under the old clear-at-threshold policy, under an LRU cache keyed on the
+# exact coordinates and start year, and under the LRU cache v5-v7 use now, keyed on the POWER grid
+# cell and year. No network access: every cache miss is charged the requests v7 would send for it.
+
+input_file = "Europe Data Set/RDS3CSV.csv"
+
+
+def load_keys(path):
+    df = pd.read_csv(path)
+    df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
+    df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
+    df["Start year"] = pd.to_numeric(df["Start year"], errors='coerce')
+    df = df.dropna(subset=["Start year", "Latitude", "Longitude"])
+    return list(zip(df["Latitude"], df["Longitude"], df["Start year"].astype(int)))
+
+
+# The policy used by NASA_API_v5 to v7: a plain dict emptied once 100 requests have been sent
+def replay_clear_at_threshold(keys, clear_cache_threshold=100):
+    cache = {}
+    request_count = 0
+    total_requests = 0
+    hits = 0
+    peak_entries = 0
+    for key in keys:
+        if key in cache:
+            hits += 1
+        else:
+            requests_sent = len(years_to_check(key[2]))
+            request_count += requests_sent
+            total_requests += requests_sent
+            cache[key] = True
+            peak_entries = max(peak_entries, len(cache))
+        if request_count >= clear_cache_threshold:
+            cache.clear()
+            request_count = 0
+    return total_requests, hits, peak_entries
+
+
+def replay_lru(keys, max_entries):
+    cache = BoundedCache(max_entries=max_entries)
+    total_requests = 0
+    for key in keys:
+        if cache.get(key) is None:
+            total_requests += len(years_to_check(key[2]))
+            cache[key] = True
+    return total_requests, cache
+
+
+# NASA_API_v6/v7: one request per (grid cell, year) the cache doesn't hold
+def replay_cell_years(keys, max_entries):
+    cache = BoundedCache(max_entries=max_entries)
+    total_requests = 0
+    for latitude, longitude, start_year in keys:
+        cell = grid_cell(latitude, longitude)
+        for year in years_to_check(start_year):
+            if cache.get((cell, year)) is None:
+                total_requests += 1
+                cache[(cell, year)] = True
+    return total_requests, cache
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare API request counts for the clear-at-threshold and LRU cache policies.")
+    parser.add_argument("--input", default=input_file)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[43, 1000, 10_000], help="LRU capacities to test (43 matches the old policy's peak size on RDS3)")
+    args = parser.parse_args()
+
+    keys = load_keys(args.input)
+    cell_years = {(grid_cell(latitude, longitude), year) for latitude, longitude, start_year in keys for year in years_to_check(start_year)}
+    print(f"{len(keys)} projects, {len(set(keys))} unique (lat, lon, start year) keys, {len(cell_years)} unique (grid cell, year) keys")
+
+    total_requests, hits, peak_entries = replay_clear_at_threshold(keys)
+    print(f"{'clear at 100 requests':<24} {total_requests:>7} requests, {hits / len(keys):6.1%} hit rate, peak {peak_entries} entries")
+
+    for max_entries in args.sizes:
+        total_requests, cache = replay_lru(keys, max_entries)
+        print(f"{f'LRU {max_entries} entries':<24} {total_requests:>7} requests, {cache.hit_rate():6.1%} hit rate, "
+              f"{cache.evictions} evictions, {cache.current_bytes} bytes")
+
+    for max_entries in args.sizes:
+        total_requests, cache = replay_cell_years(keys, max_entries)
+        print(f"{f'cell-year LRU {max_entries}':<24} {total_requests:>7} requests, {cache.hit_rate():6.1%} hit rate, "
+              f"{cache.evictions} evictions, {cache.current_bytes} bytes")
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import NASA_API_v8
+from climatology_store import ClimatologyStore, derive_features, parameters
+from mock_servers import fake_parameter, start_power_server
+from wind_cache import WindSpeedCache, cell_centre
+
+# Throughput benchmark: the sequential NASA_API_v7 request pattern against the async, coalescing
+# NASA_API_v8 engine, both pointed at the local POWER stand-in server. The climatology store the
+# async run fills is then checked against the values the stand-in served.
+
+input_file = "Europe Data Set/RDS3CSV.csv"
+
+
+# Same request pattern as NASA_API_v7: one blocking request per (entry, year) followed by a fixed sleep
+def run_sequential(df, url, sleep_seconds):
+    request_count = 0
+    for _, row in df.iterrows():
+        for year in NASA_API_v8.years_to_check(int(row["Start year"])):
+            params = {
+                "start": year,
+                "end": year,
+                "latitude": row["Latitude"],
+                "longitude": row["Longitude"],
+                "community": "ag",
+                "parameters": "WS50M",
+                "format": "json",
+                "header": "true"
+            }
+            response = requests.get(url, params=params)
+            request_count += 1
+            if response.status_code == 200:
+                response.json()["properties"]["parameter"]["WS50M"].get(f"{year}13", None)
+            time.sleep(sleep_seconds)
+    return request_count
+
+
+# The compacted store must hold each served monthly value (and the annual "13" value) exactly as
+# float32, once per key, with annual WS50M equal to the wind speed cache
+def check_store(store_path, cache_file):
+    store = ClimatologyStore(store_path, parameters)
+    assert len(store.parts()) == 1
+    df = store.load()
+    assert len(df) and not df.duplicated(["lat_cell", "lon_cell", "year", "month"]).any()
+
+    cache = WindSpeedCache(cache_file)
+    for row in df.itertuples(index=False):
+        cell, year = (int(row.lat_cell), int(row.lon_cell)), int(row.year)
+        latitude, longitude = cell_centre(cell)
+        for parameter in parameters:
+            monthly = [fake_parameter(parameter, latitude, longitude, year, month) for month in range(1, 13)]
+            served = round(sum(monthly) / 12.0, 2) if row.month == 13 else monthly[row.month - 1]
+            assert np.float32(served) == getattr(row, parameter), (row, parameter)
+        if row.month == 13:
+            assert np.float32(cache.get(cell, [year])[year]) == row.WS50M, row
+    cache.close()
+
+    features = derive_features(df)
+    assert len(features) == len(df) // 13 and features["Mean WS50M"].notna().all()
+    print(f"store        {len(df)} rows for {len(features)} grid cell years round-trip the served values")
+
+
+def report(label, project_count, request_count, elapsed):
+    print(f"{label:<12} {request_count:>6} requests in {elapsed:8.2f} s  ->  {request_count / elapsed:8.1f} requests/s, "
+          f"{project_count / elapsed:8.1f} projects/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs async NASA POWER fetching against a local stand-in server.")
+    parser.add_argument("--projects", type=int, default=30, help="Number of RDS projects to enrich")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in server latency per request in seconds")
+    parser.add_argument("--legacy-sleep", type=float, default=1.0, help="Fixed sleep after each request in the sequential run")
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--rps", type=float, default=100.0)
+    args = parser.parse_args()
+
+    df = pd.read_csv(input_file)
+    df["Latitude"] = pd.to_numeric(df["Latitude"], errors='coerce')
+    df["Longitude"] = pd.to_numeric(df["Longitude"], errors='coerce')
+    df["Start year"] = pd.to_numeric(df["Start year"], errors='coerce')
+    df = df.dropna(subset=["Start year"])
+    df = df.head(args.projects)
+
+    server, url = start_power_server(latency=args.latency)
+    print(f"Stand-in server at {url} with {args.latency * 1000:.0f} ms latency, {len(df)} projects")
+
+    start = time.perf_counter()
+    request_count = run_sequential(df, url, args.legacy_sleep)
+    report("sequential", len(df), request_count, time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sample_file = os.path.join(tmp, "input.csv")
+        df.to_csv(sample_file, index=False)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fetcher = asyncio.run(NASA_API_v8.run(sample_file, os.path.join(tmp, "output.csv"), url,
+                                                  args.max_in_flight, args.rps, args.max_in_flight,
+                                                  os.path.join(tmp, "cache.sqlite"), os.path.join(tmp, "store")))
+        report("async", len(df), fetcher.total_requests, time.perf_counter() - start)
+        check_store(os.path.join(tmp, "store"), os.path.join(tmp, "cache.sqlite"))
+
+    server.shutdown()
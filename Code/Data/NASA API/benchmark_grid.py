@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from check_grid_interpolation import check_wind_grid
+from NASA_API_v8 import run_grid, years_to_check
+from wind_grid import europe_bbox, load_grid, make_synthetic_grid, synthetic_wind_speed
+
+# Offline check and benchmark of the bulk-grid mode. The synthetic field is linear in latitude and
+# longitude, so bilinear interpolation must reproduce it exactly at any point inside the grid
+# (check_grid_interpolation.py), and the per-project averages must follow years_to_check.
+
+
+def random_projects(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Entry ID": np.arange(1, count + 1),
+        "Latitude": rng.uniform(europe_bbox["lat_min"], europe_bbox["lat_max"], count),
+        "Longitude": rng.uniform(europe_bbox["lon_min"], europe_bbox["lon_max"], count),
+        "Start year": rng.integers(1995, 2030, count),
+    })
+
+
+# Expected average from the analytic field, following years_to_check project by project
+def expected_average(projects):
+    expected = []
+    for latitude, longitude, start_year in zip(projects["Latitude"], projects["Longitude"], projects["Start year"]):
+        years = [year for year in years_to_check(int(start_year)) if year >= 2000]
+        values = [synthetic_wind_speed(latitude, longitude, year) for year in years]
+        expected.append(sum(values) / len(values) if values else np.nan)
+    return np.array(expected)
+
+
+def check_average_wind_speed(grid, count=2_000):
+    projects = random_projects(count)
+    result = grid.average_wind_speed(projects["Latitude"], projects["Longitude"], projects["Start year"])
+    expected = expected_average(projects)
+    assert np.array_equal(np.isnan(result), np.isnan(expected)), "Coverage differs from years_to_check"
+    error = np.nanmax(np.abs(result - expected))
+    assert error < 1e-9, f"Interpolation error {error}"
+    return error
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and time bulk-grid wind speed interpolation on a synthetic grid.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6_000, 600_000])
+    args = parser.parse_args()
+
+    grid = make_synthetic_grid()
+    print(f"Synthetic grid: {len(grid.years)} years x {len(grid.latitudes)} x {len(grid.longitudes)}")
+
+    # Accuracy against the analytic field
+    check_wind_grid(grid)
+    error = check_average_wind_speed(grid)
+    print(f"Max interpolation error on 2,000 projects: {error:.2e}")
+
+    # Throughput of the vectorized lookup
+    for count in args.sizes:
+        projects = random_projects(count)
+        start = time.perf_counter()
+        grid.average_wind_speed(projects["Latitude"].to_numpy(), projects["Longitude"].to_numpy(), projects["Start year"].to_numpy())
+        elapsed = time.perf_counter() - start
+        print(f"{count:>9,} projects in {elapsed * 1000:8.1f} ms  ->  {count / elapsed:12,.0f} projects/s")
+
+    # End-to-end through the CSV grid file and the NASA_API_v8 grid mode
+    with tempfile.TemporaryDirectory() as tmp:
+        years, lats, lons = np.meshgrid(grid.years, grid.latitudes, grid.longitudes, indexing="ij")
+        grid_file = os.path.join(tmp, "grid.csv")
+        pd.DataFrame({"Year": years.ravel(), "Latitude": lats.ravel(), "Longitude": lons.ravel(),
+                      "WS50M": grid.values.ravel()}).to_csv(grid_file, index=False)
+        assert np.allclose(load_grid(grid_file).values, grid.values)
+
+        projects = random_projects(6_000)
+        input_file = os.path.join(tmp, "input.csv")
+        projects.to_csv(input_file, index=False)
+        start = time.perf_counter()
+        run_grid(input_file, os.path.join(tmp, "output.csv"), grid_file)
+        print(f"Grid mode end to end (load grid CSV, interpolate, write output): {time.perf_counter() - start:.2f} s")
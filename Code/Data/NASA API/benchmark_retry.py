@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import NASA_API_v8
+from mock_servers import start_power_server
+from resilience import RetryPolicy
+
+# Fault-injection benchmark: the POWER stand-in returns a share of random 429/5xx responses plus a
+# full outage window. Compares failing fast (one attempt, the NASA_API_v7 behaviour) followed by
+# a --replay-failures pass, against retrying with backoff and the circuit breaker.
+
+input_file = "Europe Data Set/RDS3CSV.csv"
+
+
+def enrich(input_path, tmp, name, url, retry, replay_failures=False):
+    output_file = os.path.join(tmp, f"{name}.csv")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetcher = asyncio.run(NASA_API_v8.run(input_path, output_file, url, 16, 0, 16,
+                                              os.path.join(tmp, f"{name}.sqlite"), "",
+                                              chunk_size=1000, retry=retry, replay_failures=replay_failures))
+    elapsed = time.perf_counter() - start
+    written = len(pd.read_csv(output_file)) if os.path.exists(output_file) else 0
+    ledger_file = output_file + ".failures.csv"
+    failed = pd.read_csv(ledger_file)["Entry ID"].nunique() if os.path.exists(ledger_file) else 0
+    return fetcher.total_requests, elapsed, written, failed
+
+
+def report(label, request_count, elapsed, written, failed):
+    print(f"{label:<28} {elapsed:7.2f} s  {request_count:>6} requests  {written:>6} written  {failed:>5} in failure ledger")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark retry, circuit breaker and failure replay against injected 429/5xx responses.")
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.15)
+    parser.add_argument("--outage-after", type=int, help="Requests into each run when the outage begins (default: a tenth of --projects)")
+    parser.add_argument("--outage", type=float, default=3.0, help="Outage length in seconds")
+    args = parser.parse_args()
+    outage_after = args.outage_after or max(1, args.projects // 10)
+
+    # Short breaker pause so the benchmark stays quick; the job default is 10 s
+    NASA_API_v8.breaker_reset_seconds = 1.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "input.csv")
+        pd.read_csv(input_file).head(args.projects).to_csv(input_path, index=False)
+
+        for label, retry in [("fail fast (1 attempt)", RetryPolicy(max_attempts=1)),
+                             ("retry with backoff", RetryPolicy(max_attempts=8, base_delay=0.25, max_delay=4.0))]:
+            server, url = start_power_server(latency=args.latency, error_rate=args.error_rate)
+            server.schedule_outage(outage_after, args.outage)
+            name = label.split()[0]
+            report(label, *enrich(input_path, tmp, name, url, retry))
+
+            # Whatever is left in the ledger is re-driven on its own once the server is healthy again
+            server.error_rate = 0.0
+            server.outage_until = 0.0
+            request_count, elapsed, written, failed = enrich(input_path, tmp, name, url, retry, replay_failures=True)
+            report("  + replay failures", request_count, elapsed, written, failed)
+            assert failed == 0, f"{failed} entries still in the failure ledger after replay against a healthy server"
+            server.shutdown()
@@ -0,0 +1,77 @@
+import sys
+from collections import OrderedDict
+
+# Bounded least-recently-used cache. Replaces the "clear everything after 100 requests" policy:
+# when the cache is full only the coldest entries are evicted, so the hot set (e.g. clustered
+# German onshore parks) survives. The limit can be an entry count, an approximate byte size, or both.
+
+
+# Approximate size of one cache entry in bytes
+def entry_size(key, value):
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(key, tuple):
+        size += sum(sys.getsizeof(item) for item in key)
+    return size
+
+
+class BoundedCache:
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=entry_size):
+        if max_entries is None and max_bytes is None:
+            raise ValueError("BoundedCache needs max_entries, max_bytes or both")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()  # key -> (value, size), least recently used first
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Look up a key, counting the hit or miss and marking it as most recently used
+    def get(self, key, default=None):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+        size = self.sizeof(key, value)
+        self.entries[key] = (value, size)
+        self.current_bytes += size
+
+        # Evict least recently used entries until both limits hold
+        while self.entries and (
+            (self.max_entries is not None and len(self.entries) > self.max_entries)
+            or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+        ):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __contains__(self, key):
+        return key in self.entries  # Membership test only, does not count towards the hit rate
+
+    def __len__(self):
+        return len(self.entries)
+
+    def pop(self, key, default=None):
+        if key in self.entries:
+            value, size = self.entries.pop(key)
+            self.current_bytes -= size
+            return value
+        return default
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return (f"{len(self.entries)} entries, {self.current_bytes} bytes, {self.hits} hits, {self.misses} misses, "
+                f"{self.hit_rate():.1%} hit rate, {self.evictions} evictions")
@@ -0,0 +1,132 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columnar store of monthly NASA POWER values per grid cell. Every fetch pulls several parameters
+# and all months, so new wind features can be derived from the store without another API crawl.
+# Rows are (lat_cell, lon_cell, year, month) with month 13 holding POWER's annual value.
+# Fetched rows are buffered and written as append-only Parquet parts; compact() merges the parts
+# into one file sorted by cell, year and month. Later parts win over earlier copies of a row, so
+# the compacted file is numbered after every part it replaces and those parts are removed only
+# once it is in place: a crash part-way leaves duplicates that the next compaction drops, never
+# a gap.
+
+parameters = ["WS50M", "WS10M", "WD50M"]
+
+schema_fields = [
+    ("lat_cell", pa.int16()),
+    ("lon_cell", pa.int16()),
+    ("year", pa.int16()),
+    ("month", pa.int8()),
+]
+
+
+def store_schema(parameter_names):
+    return pa.schema(schema_fields + [(parameter, pa.float32()) for parameter in parameter_names])
+
+
+# Turn one POWER point response into rows for a grid cell, replacing the -999 fill value with NaN
+def parse_power_response(data, cell, parameter_names):
+    values = data["properties"]["parameter"]
+    keys = sorted(values[parameter_names[0]])
+    rows = {
+        "lat_cell": [cell[0]] * len(keys),
+        "lon_cell": [cell[1]] * len(keys),
+        "year": [int(key[:4]) for key in keys],
+        "month": [int(key[4:]) for key in keys],
+    }
+    for parameter in parameter_names:
+        column = [values.get(parameter, {}).get(key) for key in keys]
+        rows[parameter] = [np.nan if value is None or value == -999 else value for value in column]
+    return rows
+
+
+class ClimatologyStore:
+    def __init__(self, path="wind_climatology", parameter_names=parameters, flush_rows=5000):
+        self.path = path
+        self.parameter_names = list(parameter_names)
+        self.schema = store_schema(self.parameter_names)
+        self.flush_rows = flush_rows
+        self.buffer = {name: [] for name in self.schema.names}
+        self.buffered_rows = 0
+        os.makedirs(path, exist_ok=True)
+
+        # Only the key columns are read to learn which (cell, year) pairs are already stored
+        self.stored = set()
+        for part in self.parts():
+            keys = pq.read_table(part, columns=["lat_cell", "lon_cell", "year"]).to_pydict()
+            self.stored.update(zip(keys["lat_cell"], keys["lon_cell"], keys["year"]))
+
+    def parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    # Path for a new part, numbered after every existing one (numbers have gaps after a compaction)
+    def next_part(self):
+        parts = self.parts()
+        number = int(os.path.basename(parts[-1])[5:-8]) + 1 if parts else 0
+        return os.path.join(self.path, f"part-{number:05d}.parquet")
+
+    def add(self, rows):
+        for name in self.schema.names:
+            self.buffer[name].extend(rows[name])
+        self.buffered_rows += len(rows["year"])
+        self.stored.update(zip(rows["lat_cell"], rows["lon_cell"], rows["year"]))
+        if self.buffered_rows >= self.flush_rows:
+            self.flush()
+
+    # Write buffered rows as a new part file
+    def flush(self):
+        if not self.buffered_rows:
+            return
+        table = pa.Table.from_pydict(self.buffer, schema=self.schema)
+        pq.write_table(table, self.next_part())
+        self.buffer = {name: [] for name in self.schema.names}
+        self.buffered_rows = 0
+
+    def load(self, columns=None):
+        self.flush()
+        parts = self.parts()
+        if not parts:
+            return self.schema.empty_table().to_pandas()
+        return pq.read_table(parts, columns=columns, schema=self.schema).to_pandas()
+
+    # Merge all parts into one file sorted by grid cell, year and month, keeping the latest copy of any row
+    def compact(self):
+        df = self.load()
+        df = df.drop_duplicates(subset=["lat_cell", "lon_cell", "year", "month"], keep="last")
+        df = df.sort_values(["lat_cell", "lon_cell", "year", "month"])
+        old_parts = self.parts()
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        pq.write_table(table, os.path.join(self.path, "compacted.tmp"))
+        os.replace(os.path.join(self.path, "compacted.tmp"), self.next_part())
+        for part in old_parts:
+            os.remove(part)
+
+
+# Derived features per grid cell and year, computed from the store with no network I/O
+# (NASA_API_v8.py --features)
+def derive_features(df):
+    monthly = df[df["month"] <= 12]
+    grouped = monthly.groupby(["lat_cell", "lon_cell", "year"])
+    features = pd.DataFrame({
+        "Mean WS50M": grouped["WS50M"].mean(),
+        "Seasonal Range WS50M": grouped["WS50M"].max() - grouped["WS50M"].min(),
+        "Winter Share WS50M": monthly[monthly["month"].isin([12, 1, 2])].groupby(["lat_cell", "lon_cell", "year"])["WS50M"].mean() / grouped["WS50M"].mean(),
+    })
+
+    # Power-law shear exponent between 10 m and 50 m
+    if "WS10M" in monthly:
+        features["Shear Exponent"] = np.log(grouped["WS50M"].mean() / grouped["WS10M"].mean()) / np.log(50 / 10)
+
+    # Directional steadiness: length of the mean unit vector of the monthly directions (1 = constant direction)
+    if "WD50M" in monthly:
+        radians = np.radians(monthly["WD50M"])
+        vectors = pd.DataFrame({"x": np.cos(radians), "y": np.sin(radians)}, index=monthly.index)
+        mean_vector = vectors.groupby([monthly["lat_cell"], monthly["lon_cell"], monthly["year"]]).mean()
+        features["Direction Steadiness"] = np.hypot(mean_vector["x"], mean_vector["y"])
+
+    return features.reset_index()
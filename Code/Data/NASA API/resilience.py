@@ -0,0 +1,118 @@
+import asyncio
+import csv
+import os
+import random
+import time
+
+import pandas as pd
+
+# Retry, circuit breaker and failure ledger used by NASA_API_v8. Transient 429/5xx responses and
+# network errors are retried with exponential backoff and full jitter; repeated failures against
+# one host open its circuit so the whole job pauses instead of burning through every project; and
+# whatever still fails is persisted so --replay-failures can re-drive just those entries.
+
+retryable_statuses = {429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, status):
+        # Network errors are recorded by exception name, HTTP errors by status code
+        return isinstance(status, str) or status in retryable_statuses
+
+    # Full jitter: a random delay up to the exponential backoff cap, or the server's Retry-After
+    def delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+# Per-host circuit breaker: opens after `failure_threshold` consecutive failures, then lets a single
+# probe request through once `reset_timeout` seconds have passed (half-open) before closing again
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.times_opened = 0
+
+    async def before_request(self):
+        while self.opened_at is not None:
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            elif not self.probing:
+                self.probing = True
+                return
+            else:
+                await asyncio.sleep(0.05)  # Another request is probing the host
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            self.times_opened += 1
+            print(f"Circuit opened after {self.failures} consecutive failures, pausing for {self.reset_timeout} s")
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+
+# Persisted (entry, year, status) rows for projects that could not be fetched
+class FailureLedger:
+    columns = ["Entry ID", "Latitude", "Longitude", "Start year", "Year", "Status"]
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = []
+
+    def record(self, entry_id, latitude, longitude, start_year, years, status):
+        for year in years:
+            self.pending.append([entry_id, latitude, longitude, start_year, year, status])
+
+    def flush(self):
+        if not self.pending:
+            return
+        write_header = not os.path.exists(self.path)
+        with open(self.path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(self.columns)
+            writer.writerows(self.pending)
+        self.pending = []
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=self.columns)
+        return pd.read_csv(self.path)
+
+    # Move the current ledger aside so a replay records only what still fails. The rows being
+    # replayed stay in '<ledger>.replayed' until finish_replay(); if a replay is interrupted, the
+    # next one merges them with anything recorded since, so no failure is dropped.
+    def start_replay(self):
+        replayed = self.path + ".replayed"
+        parts = [pd.read_csv(path) for path in (replayed, self.path) if os.path.exists(path)]
+        failures = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=self.columns)
+        if os.path.exists(self.path):
+            temporary = replayed + ".tmp"
+            failures.to_csv(temporary, index=False)
+            os.replace(temporary, replayed)
+            os.remove(self.path)
+        return failures
+
+    # The replay ran to the end: whatever still fails is back in the ledger
+    def finish_replay(self):
+        if os.path.exists(self.path + ".replayed"):
+            os.remove(self.path + ".replayed")
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Append-only resume checkpoint: one bit per integer Entry ID, stored in a small sidecar file next
+# to the output CSV. Loading it costs (largest Entry ID / 8) bytes however many rows the output
+# holds, so resuming never holds the output in memory. The sidecar is only trusted while it agrees
+# with the output's Entry ID column (streamed a chunk at a time when a run opens it).
+
+
+class ResumeIndex:
+    def __init__(self, path):
+        self.path = path
+        self.bits = bytearray()
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self.bits = bytearray(f.read())
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # Vectorized membership test for an array of Entry IDs
+    def contains(self, entry_ids):
+        entry_ids = np.asarray(entry_ids, dtype=np.int64)
+        bits = np.frombuffer(bytes(self.bits), dtype=np.uint8)
+        byte_index = entry_ids >> 3
+        known = (entry_ids >= 0) & (byte_index < len(bits))
+        result = np.zeros(len(entry_ids), dtype=bool)
+        result[known] = (bits[byte_index[known]] >> (entry_ids[known] & 7)) & 1 == 1
+        return result
+
+    def count(self):
+        return int(np.unpackbits(np.frombuffer(bytes(self.bits), dtype=np.uint8)).sum())
+
+    # Set the bits for newly written entries and persist only the bytes that changed
+    def mark(self, entry_ids):
+        entry_ids = [int(entry_id) for entry_id in entry_ids]
+        if not entry_ids:
+            return
+        highest_byte = max(entry_ids) >> 3
+        if highest_byte >= len(self.bits):
+            self.bits.extend(bytes(highest_byte + 1 - len(self.bits)))
+        for entry_id in entry_ids:
+            self.bits[entry_id >> 3] |= 1 << (entry_id & 7)
+
+        first_byte = min(entry_ids) >> 3
+        mode = "r+b" if os.path.exists(self.path) else "wb"
+        with open(self.path, mode) as f:
+            f.seek(first_byte)
+            f.write(self.bits[first_byte:highest_byte + 1])
+            f.flush()
+            os.fsync(f.fileno())
+
+    # Forget every entry, e.g. when the output was deleted to start over
+    def discard(self):
+        self.bits = bytearray()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # Make the checkpoint match the Entry IDs actually in the output CSV: outputs written before the
+    # checkpoint existed, a crash between writing a batch and marking it, or an output replaced by
+    # another run. Returns True when the sidecar had to be rewritten.
+    def sync_with_output(self, output_file, chunk_size=100_000):
+        bits = np.zeros(0, dtype=np.uint8)
+        for chunk in pd.read_csv(output_file, usecols=["Entry ID"], chunksize=chunk_size):
+            entry_ids = chunk["Entry ID"].dropna().to_numpy(dtype=np.int64)
+            if not len(entry_ids):
+                continue
+            if entry_ids.max() >> 3 >= len(bits):
+                bits = np.concatenate([bits, np.zeros((entry_ids.max() >> 3) + 1 - len(bits), dtype=np.uint8)])
+            np.bitwise_or.at(bits, entry_ids >> 3, (1 << (entry_ids & 7)).astype(np.uint8))
+
+        # Trailing zero bytes carry no entries
+        if bytes(bits).rstrip(b"\0") == bytes(self.bits).rstrip(b"\0") and self.exists():
+            return False
+        self.bits = bytearray(bits.tobytes())
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(self.bits)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        return True
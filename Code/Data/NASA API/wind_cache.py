@@ -0,0 +1,64 @@
+import sqlite3
+
+# Persistent annual wind speed cache shared across runs and dataset revisions.
+# NASA POWER meteorology comes from MERRA-2 on a 0.5 deg latitude x 0.625 deg longitude grid,
+# so every coordinate inside one grid cell returns identical values. Entries are therefore keyed
+# by the grid cell a coordinate snaps to plus the year, and hold the per-year value rather than
+# a per-project average.
+
+lat_step = 0.5
+lon_step = 0.625
+lon_cells = int(360 / lon_step)
+
+
+# Snap a coordinate to the (lat, lon) index of the nearest POWER grid point
+def grid_cell(latitude, longitude):
+    lat_index = int(round((latitude + 90) / lat_step))
+    lon_index = int(round((longitude + 180) / lon_step)) % lon_cells
+    return lat_index, lon_index
+
+
+# Coordinate of the grid point itself, used when requesting data for a cell
+def cell_centre(cell):
+    lat_index, lon_index = cell
+    return round(-90 + lat_index * lat_step, 4), round(-180 + lon_index * lon_step, 4)
+
+
+class WindSpeedCache:
+    def __init__(self, path="wind_speed_cache.sqlite"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS annual_wind_speed ("
+            "lat_cell INTEGER NOT NULL, lon_cell INTEGER NOT NULL, year INTEGER NOT NULL, ws50m REAL NOT NULL, "
+            "PRIMARY KEY (lat_cell, lon_cell, year)) WITHOUT ROWID"
+        )
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    # Return {year: value} for the requested years found in the cache, counting hits and misses per year
+    def get(self, cell, years):
+        years = list(years)
+        placeholders = ",".join("?" * len(years))
+        rows = self.connection.execute(
+            f"SELECT year, ws50m FROM annual_wind_speed WHERE lat_cell = ? AND lon_cell = ? AND year IN ({placeholders})",
+            (cell[0], cell[1], *years)
+        ).fetchall()
+        values = dict(rows)
+        self.hits += len(values)
+        self.misses += len(years) - len(values)
+        return values
+
+    # Store {year: value} for a cell, skipping years the API had no value for
+    def put(self, cell, values):
+        rows = [(cell[0], cell[1], year, value) for year, value in values.items() if value is not None]
+        self.connection.executemany("INSERT OR REPLACE INTO annual_wind_speed VALUES (?, ?, ?, ?)", rows)
+        self.connection.commit()
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self):
+        self.connection.close()
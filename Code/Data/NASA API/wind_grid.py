@@ -0,0 +1,136 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from grid_interpolation import array_corners, bilinear, open_netcdf
+
+# Regional bulk-grid mode: the annual WS50M field for a Europe bounding box is loaded once per year
+# into a NumPy array (years x latitudes x longitudes) and every project is answered by vectorized
+# bilinear interpolation, so 6k or 600k projects cost a single array operation instead of one
+# request each.
+
+# Europe bounding box (degrees)
+europe_bbox = {"lat_min": 34.0, "lat_max": 72.0, "lon_min": -25.0, "lon_max": 45.0}
+
+# NASA POWER regional endpoint, limited to boxes of at most 10 x 10 degrees per request
+regional_url = "https://power.larc.nasa.gov/api/temporal/monthly/regional"
+tile_size = 10.0
+
+
+class WindGrid:
+    def __init__(self, years, latitudes, longitudes, values):
+        self.years = np.asarray(years, dtype=int)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.values = np.asarray(values, dtype=float)  # shape (years, latitudes, longitudes)
+
+        # Bilinear lookups below index the axes arithmetically, so the grid must be regular
+        for axis in (self.latitudes, self.longitudes):
+            steps = np.diff(axis)
+            if len(steps) == 0 or not np.allclose(steps, steps[0]) or steps[0] <= 0:
+                raise ValueError("Grid axes must be ascending with a constant spacing")
+        self.lat_step = self.latitudes[1] - self.latitudes[0]
+        self.lon_step = self.longitudes[1] - self.longitudes[0]
+
+    # Bilinear interpolation of the field for arrays of coordinates and years (NaN outside the grid)
+    def interpolate(self, latitudes, longitudes, years):
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        years = np.asarray(years, dtype=int)
+        year_index = np.clip(np.searchsorted(self.years, years), 0, len(self.years) - 1)
+
+        row = (latitudes - self.latitudes[0]) / self.lat_step
+        col = (longitudes - self.longitudes[0]) / self.lon_step
+        result = bilinear(row, col, self.values.shape[1:], array_corners(self.values, year_index))
+        return np.where(self.years[year_index] == years, result, np.nan)
+
+    # Vectorized equivalent of NASA_API_v8: mean of the annual values for start year - 1 .. start year + 1
+    def average_wind_speed(self, latitudes, longitudes, start_years, last_year=2022):
+        start_years = np.asarray(start_years, dtype=int)
+        samples = []
+        for offset in (-1, 0, 1):
+            years = start_years + offset
+            value = self.interpolate(latitudes, longitudes, np.minimum(years, last_year))
+            # Projects starting after the last year only use the last year, as in years_to_check
+            keep = np.where(start_years > last_year, offset == 0, years <= last_year)
+            samples.append(np.where(keep, value, np.nan))
+        samples = np.vstack(samples)
+        counts = np.sum(~np.isnan(samples), axis=0)
+        totals = np.nansum(samples, axis=0)
+        return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+
+# Build a WindGrid from a long-format table with Year, Latitude, Longitude and WS50M columns
+def grid_from_frame(df, parameter="WS50M"):
+    years = np.sort(df["Year"].unique())
+    latitudes = np.sort(df["Latitude"].unique())
+    longitudes = np.sort(df["Longitude"].unique())
+    values = np.full((len(years), len(latitudes), len(longitudes)), np.nan)
+    values[
+        np.searchsorted(years, df["Year"].to_numpy()),
+        np.searchsorted(latitudes, df["Latitude"].to_numpy()),
+        np.searchsorted(longitudes, df["Longitude"].to_numpy()),
+    ] = df[parameter].to_numpy(dtype=float)
+    return WindGrid(years, latitudes, longitudes, values)
+
+
+def load_grid(path, parameter="WS50M"):
+    if path.endswith(".nc"):
+        dataset = open_netcdf(path)
+        field = dataset[parameter].transpose("year", "lat", "lon")
+        return WindGrid(field["year"].values, field["lat"].values, field["lon"].values, field.values)
+
+    return grid_from_frame(pd.read_csv(path), parameter)
+
+
+# Download the annual field for every year over the bounding box, tile by tile, into a long table
+def download_grid(years, bbox=europe_bbox, url=regional_url, parameter="WS50M"):
+    rows = []
+    for lat_min in np.arange(bbox["lat_min"], bbox["lat_max"], tile_size):
+        for lon_min in np.arange(bbox["lon_min"], bbox["lon_max"], tile_size):
+            params = {
+                "start": min(years),
+                "end": max(years),
+                "latitude-min": lat_min,
+                "latitude-max": min(lat_min + tile_size, bbox["lat_max"]),
+                "longitude-min": lon_min,
+                "longitude-max": min(lon_min + tile_size, bbox["lon_max"]),
+                "community": "ag",
+                "parameters": parameter,
+                "format": "json",
+                "header": "true"
+            }
+            response = requests.get(url, params=params, timeout=300)
+            if response.status_code != 200:
+                print(f"Failed to retrieve tile {lat_min}, {lon_min}. Status code: {response.status_code}")
+                continue
+
+            for feature in response.json()["features"]:
+                longitude, latitude = feature["geometry"]["coordinates"][:2]
+                values = feature["properties"]["parameter"][parameter]
+                for year in years:
+                    value = values.get(f"{year}13")
+                    if value is not None and value != -999:
+                        rows.append({"Year": year, "Latitude": latitude, "Longitude": longitude, parameter: value})
+            print(f"Downloaded tile {lat_min}, {lon_min}")
+
+    # Tiles share their edges, so keep one copy of each grid point
+    return pd.DataFrame(rows).drop_duplicates(subset=["Year", "Latitude", "Longitude"])
+
+
+# Synthetic grid whose field is linear in latitude and longitude, so bilinear interpolation is exact
+def make_synthetic_grid(years=range(2000, 2023), bbox=europe_bbox, lat_step=0.5, lon_step=0.625):
+    years = np.array(list(years))
+    latitudes = np.arange(bbox["lat_min"], bbox["lat_max"] + lat_step / 2, lat_step)
+    longitudes = np.arange(bbox["lon_min"], bbox["lon_max"] + lon_step / 2, lon_step)
+    values = synthetic_wind_speed(latitudes[None, :, None], longitudes[None, None, :], years[:, None, None])
+    return WindGrid(years, latitudes, longitudes, values)
+
+
+def synthetic_wind_speed(latitudes, longitudes, years):
+    return 5.0 + 0.05 * latitudes - 0.02 * longitudes + 0.01 * (years - 2000)
@@ -0,0 +1,84 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from coast_raster import RasterShoreDistance, build_raster, load_raster, save_raster
+from coast_segments import SegmentShoreDistance, build_segments
+from shore_engine import load_coast, make_synthetic_coast
+
+# Distance-to-coast raster against the tree engine. The raster is built over the coastline's
+# bounding box plus a margin, saved and reopened memory-mapped; every site is then answered by the
+# exact segment engine (the reference), by the interpolated raster alone, by the refined lookup
+# (Vincenty to each cell's nearest coast point), and by the refined lookup with the tree fallback
+# near the coast. Pass --coast for a real coast.txt; otherwise the synthetic coastline.
+
+
+def report(label, elapsed, count, error=None):
+    line = f"{label:<26} {count / elapsed:12,.0f} sites/s"
+    if error is not None:
+        line += f"  error p50 {np.nanpercentile(error, 50):7.1f} m  p99 {np.nanpercentile(error, 99):7.1f} m  max {np.nanmax(error):7.1f} m"
+    print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare distance-to-coast raster lookups with tree queries.")
+    parser.add_argument("--coast", help="coast.txt file of lon lat rows (default: synthetic coastline)")
+    parser.add_argument("--sites", type=int, default=50_000)
+    parser.add_argument("--cell", type=float, default=1000.0, help="Raster cell size in metres")
+    parser.add_argument("--margin", type=float, default=4.0, help="Degrees added around the coastline's bounding box")
+    args = parser.parse_args()
+
+    coast = load_coast(args.coast) if args.coast else make_synthetic_coast()
+    finite = coast[~np.isnan(coast).any(axis=1)]
+    bbox = {"lat_min": finite[:, 1].min() - args.margin, "lat_max": finite[:, 1].max() + args.margin,
+            "lon_min": finite[:, 0].min() - args.margin, "lon_max": finite[:, 0].max() + args.margin}
+
+    start = time.perf_counter()
+    raster = build_raster(coast, bbox, args.cell)
+    print(f"Raster {raster.rows:,} x {raster.cols:,} cells of {args.cell:g} m built in {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(bbox["lat_min"] + 0.5, bbox["lat_max"] - 0.5, args.sites)
+    longitudes = rng.uniform(bbox["lon_min"] + 0.5, bbox["lon_max"] - 0.5, args.sites)
+
+    engine = SegmentShoreDistance(*build_segments(coast, tolerance=1.0))
+    start = time.perf_counter()
+    truth, _, _ = engine.query(latitudes, longitudes)
+    report("tree (segments, 1 m)", time.perf_counter() - start, args.sites)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raster_file = os.path.join(tmp, "coast_distance.float32")
+        save_raster(raster, raster_file)
+        mapped = load_raster(raster_file)
+        assert isinstance(mapped.distances, np.memmap)
+
+        start = time.perf_counter()
+        raster_only = mapped.distance(latitudes, longitudes)
+        report("raster only", time.perf_counter() - start, args.sites, np.abs(raster_only - truth))
+
+        start = time.perf_counter()
+        refined = mapped.refined_distance(latitudes, longitudes)
+        report("refined raster", time.perf_counter() - start, args.sites, np.abs(refined - truth))
+        # Refined lookups measure to a real coast point, so they only ever overestimate
+        assert np.all(refined[~np.isnan(refined)] >= truth[~np.isnan(refined)] - 1.0)
+
+        # Error by distance band shows where the projection and cell size matter; the refined tail
+        # (a different stretch of coast looking nearest on the grid) grows with distance
+        for low, high in [(0, 10_000), (10_000, 100_000), (100_000, np.inf)]:
+            band = (truth >= low) & (truth < high)
+            if band.any():
+                relative = np.abs(raster_only[band] - truth[band]) / np.maximum(truth[band], 1.0)
+                error_refined = np.abs(refined[band] - truth[band])
+                print(f"  {low / 1000:>5.0f}-{high / 1000:<5.0f} km  {band.sum():>7,} sites  relative error p50 "
+                      f"{np.median(relative):.2%} raster, {np.median(error_refined / np.maximum(truth[band], 1.0)):.2%} refined"
+                      f"  (refined p99 {np.percentile(error_refined, 99):6.1f} m, max {error_refined.max():6.1f} m)")
+
+        combined = RasterShoreDistance(mapped, engine)
+        start = time.perf_counter()
+        distances = combined.distance(latitudes, longitudes)
+        report("refined + tree fallback", time.perf_counter() - start, args.sites, np.abs(distances - truth))
+        print(f"  {combined.fallback_count:,} of {args.sites:,} sites ({combined.fallback_count / args.sites:.1%}) "
+              f"within {combined.fallback_distance / 1000:g} km of the coast used the tree")
@@ -0,0 +1,117 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import vptree
+
+from coast_index import open_segment_index
+from coast_segments import SegmentShoreDistance, build_segments, densify, split_polylines
+from shore_engine import ShoreDistance, geodesic_distance, load_coast, make_synthetic_coast
+
+# Bulk shore-distance engine against the VP-tree of shore_distance_api.py on the same coastline
+# and vessels. Pass --coast to use a real coast.txt; otherwise a synthetic 20k-vertex coastline
+# is used. The VP-tree answer is the reference for the vertex engine; the segment engine is
+# checked against the coastline densified to 10 m vertex spacing, open sea and near-shore sites.
+# Last, startup from coast.txt is compared with opening the persisted, memory-mapped index.
+
+
+def random_vessels(coast, count, seed=1):
+    rng = np.random.default_rng(seed)
+    lon_min, lat_min = coast.min(axis=0) - 2.0
+    lon_max, lat_max = coast.max(axis=0) + 2.0
+    return np.column_stack([rng.uniform(lon_min, lon_max, count), rng.uniform(lat_min, lat_max, count)])
+
+
+# Sites within a few km of random coast vertices
+def near_shore_vessels(coast, count, seed=3):
+    rng = np.random.default_rng(seed)
+    return coast[rng.integers(0, len(coast), count)] + rng.uniform(-0.05, 0.05, (count, 2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the bulk shore-distance engine with the VP-tree of shore_distance_api.py.")
+    parser.add_argument("--coast", help="coast.txt file of lon lat rows (default: synthetic coastline)")
+    parser.add_argument("--vessels", type=int, default=200, help="Random vessels checked against the VP-tree")
+    parser.add_argument("--bulk", type=int, default=100_000, help="Random vessels timed through the engine alone")
+    parser.add_argument("--tolerances", type=float, nargs="+", default=[10.0, 50.0, 200.0],
+                        help="Douglas-Peucker tolerances (m) for the segment engine")
+    args = parser.parse_args()
+
+    coast = load_coast(args.coast) if args.coast else make_synthetic_coast()
+    print(f"Coastline: {len(coast):,} vertices from {os.path.basename(args.coast) if args.coast else 'synthetic outline'}")
+    vessels = random_vessels(coast, args.vessels)
+
+    # Reference: the VP-tree with shore_distance_api's geographiclib metric, counting metric calls
+    calls = [0]
+
+    def geoddist(p1, p2):
+        calls[0] += 1
+        return geodesic_distance(p1[1], p1[0], p2[1], p2[0])[0]
+
+    start = time.perf_counter()
+    tree = vptree.VPTree(list(coast), geoddist)
+    build_seconds = time.perf_counter() - start
+    build_calls = calls[0]
+    start = time.perf_counter()
+    reference = np.array([tree.get_nearest_neighbor(v)[0] for v in vessels])
+    query_seconds = time.perf_counter() - start
+    print(f"VP-tree   build {build_seconds:7.2f} s ({build_calls:,} geodesics), {len(vessels)} vessels in {query_seconds:7.2f} s  "
+          f"->  {len(vessels) / query_seconds:10,.1f} vessels/s, {(calls[0] - build_calls) / len(vessels):,.0f} geodesics per vessel")
+
+    engine = ShoreDistance(coast)
+    start = time.perf_counter()
+    distances, _, _ = engine.query(vessels[:, 1], vessels[:, 0])
+    elapsed = time.perf_counter() - start
+    error = np.abs(distances - reference)
+    print(f"engine    {len(vessels)} vessels in {elapsed:7.2f} s  ->  {len(vessels) / elapsed:10,.1f} vessels/s, "
+          f"{engine.geodesic_evaluations / len(vessels):,.0f} geodesics and {engine.candidate_evaluations / len(vessels):,.1f} "
+          f"Vincenty candidates per vessel")
+    print(f"          max difference from the VP-tree {error.max():.2e} m ({np.mean(error > 1e-3):.1%} of vessels differ by over 1 mm)")
+
+    vessels = random_vessels(coast, args.bulk, seed=2)
+    start = time.perf_counter()
+    engine.query(vessels[:, 1], vessels[:, 0])
+    elapsed = time.perf_counter() - start
+    print(f"engine    {args.bulk:,} vessels in {elapsed:7.2f} s  ->  {args.bulk / elapsed:10,.1f} vessels/s")
+
+    # Vertex engine on the full coastline against segment engines on simplified ones
+    reference = ShoreDistance(np.vstack([densify(polyline, 10.0) for polyline in split_polylines(coast)]))
+    sites = np.vstack([random_vessels(coast, 2_000, seed=4), near_shore_vessels(coast, 2_000)])
+    truth, _, _ = reference.query(sites[:, 1], sites[:, 0])
+    print(f"reference {len(reference.coast):,} vertices at 10 m spacing; {len(sites):,} sites, half within ~5 km of the coast")
+
+    for label, engine in [("vertices", ShoreDistance(coast))] + [
+            (f"segments {tolerance:g} m", SegmentShoreDistance(*build_segments(coast, tolerance))) for tolerance in args.tolerances]:
+        size = len(engine.coast) if isinstance(engine, ShoreDistance) else engine.segment_count
+        start = time.perf_counter()
+        distances, _, _ = engine.query(sites[:, 1], sites[:, 0])
+        elapsed = time.perf_counter() - start
+        error = np.abs(distances - truth)
+        print(f"{label:<16} {size:>7,} in index  {len(sites) / elapsed:8,.0f} sites/s  error max {error.max():8.2f} m  "
+              f"mean {error.mean():6.2f} m")
+
+    # Startup: parse and build from the text file, then reopen the persisted index
+    with tempfile.TemporaryDirectory() as tmp:
+        coast_file = args.coast or os.path.join(tmp, "coast.txt")
+        if not args.coast:
+            np.savetxt(coast_file, coast)
+        index_dir = os.path.join(tmp, "segment-index")
+        for label in ["first run (build and save index)", "later run (memory-mapped index)"]:
+            start = time.perf_counter()
+            engine = open_segment_index(coast_file, path=index_dir)
+            engine.query(sites[:1, 1], sites[:1, 0])
+            print(f"{label:<36} {time.perf_counter() - start:8.3f} s to first answer")
+        assert isinstance(engine.start, np.memmap)
+
+        if not args.coast:
+            # Same content with a new mtime stays valid; changed content rebuilds
+            os.utime(coast_file)
+            start = time.perf_counter()
+            open_segment_index(coast_file, path=index_dir)
+            print(f"{'touched, unchanged coast.txt':<36} {time.perf_counter() - start:8.3f} s (hash matched, index kept)")
+            np.savetxt(coast_file, coast[::2])
+            engine = open_segment_index(coast_file, path=index_dir)
+            assert engine.segment_count == SegmentShoreDistance(*build_segments(coast[::2])).segment_count
+            print("changed coast.txt rebuilt the index")
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from coast_segments import SegmentShoreDistance, build_segments, max_gap, max_segment, segment_arrays, simplify_tolerance
+from file_manifest import manifest_is_current, start_build, write_manifest
+from shore_engine import ShoreDistance, ecef, load_coast
+
+# Persisted coastline index. Parsing coast.txt with numpy.loadtxt and simplifying it dominates the
+# startup of every run, so the prepared arrays are written once as .npy files in a directory next
+# to the source and later runs open them with mmap_mode="r": startup is near-instant, and worker
+# processes opening the same index share its pages through the OS page cache. The KD-tree is
+# rebuilt over the mapped arrays in C (copy_data=False), which is fast next to the text parsing.
+#
+# manifest.json (file_manifest.py) records the source file's size, mtime and SHA-256 plus the build
+# settings, and a changed coastline rebuilds the index automatically.
+
+index_version = 1
+
+
+def index_path(coast_path, kind):
+    return f"{coast_path}.{kind}-index"
+
+
+# True when the index at `path` was built from the current source with the same settings
+def index_is_current(path, coast_path, settings):
+    return manifest_is_current(path, coast_path, {"version": index_version, "settings": settings})
+
+
+def save_arrays(path, coast_path, settings, arrays):
+    start_build(path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+    write_manifest(path, coast_path, {"version": index_version, "settings": settings, "source": os.path.abspath(coast_path)})
+
+
+def load_arrays(path, names):
+    return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in names}
+
+
+# Segment engine for a coast.txt file, from its persisted index when current, else built and saved
+def open_segment_index(coast_path, tolerance=simplify_tolerance, max_gap=max_gap, max_segment=max_segment, path=None):
+    path = path or index_path(coast_path, "segment")
+    settings = {"tolerance": tolerance, "max_gap": max_gap, "max_segment": max_segment}
+    names = ["start", "end", "start_unit", "end_unit", "midpoints", "max_radius"]
+    if not index_is_current(path, coast_path, settings):
+        print(f"Building segment index for {coast_path} in {path}")
+        start, end = build_segments(load_coast(coast_path), tolerance, max_gap, max_segment)
+        save_arrays(path, coast_path, settings, {"start": start, "end": end, **segment_arrays(start, end)})
+    arrays = load_arrays(path, names)
+    return SegmentShoreDistance(arrays["start"], arrays["end"], arrays)
+
+
+# Vertex engine for a coast.txt file, from its persisted index when current, else built and saved
+def open_vertex_index(coast_path, path=None):
+    path = path or index_path(coast_path, "vertex")
+    if not index_is_current(path, coast_path, {}):
+        print(f"Building vertex index for {coast_path} in {path}")
+        coast = load_coast(coast_path)
+        save_arrays(path, coast_path, {}, {"coast": coast, "positions": ecef(coast[:, 1], coast[:, 0])})
+    arrays = load_arrays(path, ["coast", "positions"])
+    return ShoreDistance(arrays["coast"], arrays["positions"])
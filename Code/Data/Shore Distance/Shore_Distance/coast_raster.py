@@ -0,0 +1,195 @@
+import json
+import os
+import sys
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from coast_segments import densify, split_polylines
+from grid_interpolation import array_corners, bilinear
+from shore_engine import vincenty_distance, wgs84_a, wgs84_e2
+
+# Precomputed distance-to-coast raster for screening large numbers of candidate sites. The coast
+# is rasterized once onto a Lambert azimuthal equal-area grid (EPSG:3035, the European LAEA grid)
+# and a Euclidean distance transform gives every cell its distance to the nearest coast cell; a
+# lookup is then a memory-mapped read instead of a tree query.
+#
+# Accuracy: rasterizing puts the coast anywhere within its cell (up to half a cell diagonal), and
+# LAEA is equal-area rather than equidistant, so projected distances stretch or shrink by up to
+# about 1% over hundreds of km at the edges of Europe. The distance transform also records which
+# coast cell is nearest, so each cell keeps the coast point that marked it: the refined lookup reads
+# that point and measures a vectorized Vincenty distance to it on the ellipsoid, which removes the
+# projection error from the distance itself. Near the coast, where the cell size dominates, lookups
+# fall back to the exact tree engine (`fallback_distance`).
+#
+# The refined distance is to a real coast point, so it never underestimates, but it is not always
+# to the nearest one. The point sits anywhere in its 1 km cell, and because LAEA scales directions
+# differently, a stretch of coast a few cells away from the true nearest point can look nearest on
+# the grid. The tail grows with distance. On the synthetic coast (benchmark_raster.py, 1 km cells,
+# sites beyond 10 km) the error is p50 27 m, p99 ~470 m and max ~3.3 km at 650 km offshore (p99 0.65%
+# of the distance, max 5%). Use the tree engine, or a larger fallback_distance, where a tighter
+# bound matters.
+#
+# Rasters are row-major files (rows from south to north) next to a JSON header with the grid size,
+# the LAEA position of the south-west cell centre and the cell size:
+#   coast_distance.float32          distance in metres
+#   coast_distance.nearest.int32    row of coast_distance.points.npy ([lon, lat]) nearest each cell
+#   coast_distance.json
+
+# EPSG:3035 (ETRS89-extended / LAEA Europe)
+laea_lat0 = 52.0
+laea_lon0 = 10.0
+false_easting = 4321000.0
+false_northing = 3210000.0
+
+# European seas (degrees)
+europe_seas_bbox = {"lat_min": 34.0, "lat_max": 72.0, "lon_min": -25.0, "lon_max": 45.0}
+
+# Raster cell size (metres)
+cell_size = 1000.0
+
+# Closer to the coast than this, lookups use the tree engine instead of the raster (metres)
+fallback_distance = 10_000.0
+
+
+def authalic_q(sin_lat):
+    e = np.sqrt(wgs84_e2)
+    return (1 - wgs84_e2) * (sin_lat / (1 - wgs84_e2 * sin_lat ** 2)
+                             - np.log((1 - e * sin_lat) / (1 + e * sin_lat)) / (2 * e))
+
+
+# Ellipsoidal LAEA forward projection (Snyder, Map Projections - A Working Manual, p. 187)
+def laea(latitudes, longitudes):
+    qp = authalic_q(1.0)
+    rq = wgs84_a * np.sqrt(qp / 2)
+    sin_lat0 = np.sin(np.radians(laea_lat0))
+    beta0 = np.arcsin(authalic_q(sin_lat0) / qp)
+    d = wgs84_a * np.cos(np.radians(laea_lat0)) / np.sqrt(1 - wgs84_e2 * sin_lat0 ** 2) / (rq * np.cos(beta0))
+
+    beta = np.arcsin(np.clip(authalic_q(np.sin(np.radians(np.asarray(latitudes, dtype=float)))) / qp, -1, 1))
+    dlon = np.radians(np.asarray(longitudes, dtype=float) - laea_lon0)
+    b = rq * np.sqrt(2 / (1 + np.sin(beta0) * np.sin(beta) + np.cos(beta0) * np.cos(beta) * np.cos(dlon)))
+    x = false_easting + b * d * np.cos(beta) * np.sin(dlon)
+    y = false_northing + b / d * (np.cos(beta0) * np.sin(beta) - np.sin(beta0) * np.cos(beta) * np.cos(dlon))
+    return x, y
+
+
+class DistanceRaster:
+    def __init__(self, distances, x_min, y_min, cell, nearest=None, points=None):
+        self.distances = distances  # (rows, cols) metres: ndarray or np.memmap
+        self.rows, self.cols = distances.shape
+        self.x_min = float(x_min)  # LAEA position of the south-west cell centre
+        self.y_min = float(y_min)
+        self.cell = float(cell)
+        self.nearest = nearest  # (rows, cols) index into points of the nearest coast point
+        self.points = points  # (coast points, 2) as [lon, lat]
+
+    def grid_position(self, latitudes, longitudes):
+        x, y = laea(latitudes, longitudes)
+        return (np.ravel(y) - self.y_min) / self.cell, (np.ravel(x) - self.x_min) / self.cell
+
+    # Bilinear interpolation of the raster for arrays of coordinates (NaN outside it)
+    def distance(self, latitudes, longitudes):
+        row, col = self.grid_position(latitudes, longitudes)
+        return bilinear(row, col, (self.rows, self.cols), array_corners(self.distances))
+
+    # Ellipsoidal distance to the coast point recorded as nearest to each point's cell (NaN outside)
+    def refined_distance(self, latitudes, longitudes):
+        latitudes = np.asarray(latitudes, dtype=float).ravel()
+        longitudes = np.asarray(longitudes, dtype=float).ravel()
+        row, col = self.grid_position(latitudes, longitudes)
+        row, col = np.rint(row), np.rint(col)
+        inside = (row >= 0) & (row <= self.rows - 1) & (col >= 0) & (col <= self.cols - 1)
+        result = np.full(row.shape, np.nan)
+        coast = self.points[self.nearest[row[inside].astype(np.int64), col[inside].astype(np.int64)]]
+        result[inside] = vincenty_distance(latitudes[inside], longitudes[inside], coast[:, 1], coast[:, 0])
+        return result
+
+
+# Rasterize the coast over a bounding box and run the distance transform
+def build_raster(coast, bbox=europe_seas_bbox, cell=cell_size):
+    # LAEA extent of the box, sampled along its edges since parallels and meridians curve
+    edge = np.linspace(0, 1, 200)
+    lats = np.concatenate([bbox["lat_min"] + 0 * edge, bbox["lat_max"] + 0 * edge,
+                           bbox["lat_min"] + (bbox["lat_max"] - bbox["lat_min"]) * edge,
+                           bbox["lat_min"] + (bbox["lat_max"] - bbox["lat_min"]) * edge])
+    lons = np.concatenate([bbox["lon_min"] + (bbox["lon_max"] - bbox["lon_min"]) * edge,
+                           bbox["lon_min"] + (bbox["lon_max"] - bbox["lon_min"]) * edge,
+                           bbox["lon_min"] + 0 * edge, bbox["lon_max"] + 0 * edge])
+    x, y = laea(lats, lons)
+    x_min, y_min = np.floor(x.min() / cell) * cell, np.floor(y.min() / cell) * cell
+    cols = int(np.ceil((x.max() - x_min) / cell)) + 1
+    rows = int(np.ceil((y.max() - y_min) / cell)) + 1
+
+    # Mark every cell a coast polyline passes through (densified to a quarter cell), keeping one
+    # coast point per marked cell
+    points = np.vstack([densify(polyline, cell / 4) if len(polyline) > 1 else polyline for polyline in split_polylines(coast)])
+    x, y = laea(points[:, 1], points[:, 0])
+    row = np.rint((y - y_min) / cell).astype(np.int64)
+    col = np.rint((x - x_min) / cell).astype(np.int64)
+    keep = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+    # Any point inside a cell will do as its coast point; take the first one that marked it
+    cells, first = np.unique(row[keep] * cols + col[keep], return_index=True)
+    points = points[keep][first]
+    land_or_sea = np.ones((rows, cols), dtype=bool)
+    land_or_sea.flat[cells] = False
+    point_of_cell = np.zeros((rows, cols), dtype=np.int32)
+    point_of_cell.flat[cells] = np.arange(len(cells), dtype=np.int32)
+
+    # Distance from every cell centre to the nearest coast cell centre, and which cell that is
+    distances, (nearest_row, nearest_col) = distance_transform_edt(land_or_sea, return_indices=True)
+    nearest = point_of_cell[nearest_row, nearest_col]
+    return DistanceRaster((distances * cell).astype(np.float32), x_min, y_min, cell, nearest, points)
+
+
+def companion_path(path, suffix):
+    return os.path.splitext(path)[0] + suffix
+
+
+def save_raster(raster, path):
+    for array, target, dtype in [(raster.distances, path, np.float32),
+                                 (raster.nearest, companion_path(path, ".nearest.int32"), np.int32)]:
+        output = np.memmap(target, dtype=dtype, mode="w+", shape=(raster.rows, raster.cols))
+        output[:] = array
+        output.flush()
+        del output
+    np.save(companion_path(path, ".points.npy"), raster.points)
+    with open(companion_path(path, ".json"), "w") as f:
+        json.dump({"rows": raster.rows, "cols": raster.cols, "x_min": raster.x_min, "y_min": raster.y_min,
+                   "cell": raster.cell, "projection": "EPSG:3035"}, f)
+
+
+# Open a saved raster memory-mapped (read only)
+def load_raster(path):
+    with open(companion_path(path, ".json")) as f:
+        header = json.load(f)
+    shape = (header["rows"], header["cols"])
+    distances = np.memmap(path, dtype=np.float32, mode="r", shape=shape)
+    nearest = np.memmap(companion_path(path, ".nearest.int32"), dtype=np.int32, mode="r", shape=shape)
+    points = np.load(companion_path(path, ".points.npy"), mmap_mode="r")
+    return DistanceRaster(distances, header["x_min"], header["y_min"], header["cell"], nearest, points)
+
+
+# Raster lookups with the tree engine (ShoreDistance or SegmentShoreDistance) answering points near
+# the coast or outside the raster; `fallback_count` says how many points took the slow path.
+# refine=False uses the interpolated raster distance alone.
+class RasterShoreDistance:
+    def __init__(self, raster, engine, fallback_distance=fallback_distance, refine=True):
+        self.raster = raster
+        self.engine = engine
+        self.fallback_distance = fallback_distance
+        self.refine = refine
+        self.fallback_count = 0
+
+    def distance(self, latitudes, longitudes):
+        latitudes = np.asarray(latitudes, dtype=float).ravel()
+        longitudes = np.asarray(longitudes, dtype=float).ravel()
+        lookup = self.raster.refined_distance if self.refine else self.raster.distance
+        distances = lookup(latitudes, longitudes)
+        fallback = ~(distances >= self.fallback_distance)  # NaN outside the raster falls back too
+        if fallback.any():
+            distances[fallback] = self.engine.query(latitudes[fallback], longitudes[fallback])[0]
+            self.fallback_count += int(fallback.sum())
+        return distances
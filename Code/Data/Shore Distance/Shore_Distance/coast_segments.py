@@ -0,0 +1,179 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from shore_engine import candidates, ecef, geodesic_distance, vincenty_distance, wgs84_e2
+
+# Coastline as polylines instead of a cloud of vertices. The distance from a site to a vertex
+# overestimates its distance to the coast by up to half the vertex spacing squared over twice the
+# distance, so vertex-only accuracy needs a huge point file; measuring to the nearest point on each
+# segment doesn't. That lets the coastline be simplified first (Douglas-Peucker to a target error),
+# so a much smaller segment index answers faster with accurate offshore distances.
+#
+# Preprocessing: coast.txt rows are split into polylines at NaN rows or at gaps longer than
+# `max_gap`, each polyline is simplified to `tolerance` metres with segments no longer than
+# `max_segment`, and the segments are indexed by a KD-tree on their ECEF midpoints.
+#
+# Query: the k nearest segment midpoints are candidates. The foot of the perpendicular on each
+# candidate is found on the great circle through its ends, Vincenty picks the nearest foot, and
+# one exact Geodesic.WGS84 distance is evaluated for it. As in ShoreDistance, k grows until no
+# segment outside the candidates can be nearer (midpoint chord minus the longest half segment).
+# Great-circle feet differ from true geodesic feet by far less than a metre on segments of a few
+# km, and a misplaced foot only changes the distance to second order.
+
+# Gap between consecutive coast.txt vertices that starts a new polyline (metres)
+max_gap = 20_000.0
+
+# Douglas-Peucker target: no removed vertex further than this from the simplified line (metres)
+simplify_tolerance = 50.0
+
+# Simplified segments are kept at most this long so the midpoint index stays tight (metres)
+max_segment = 10_000.0
+
+
+# Distance in metres from each point to the 3D segment a-b, broadcasting over the arguments
+def chord_segment_distance(points, a, b):
+    direction = b - a
+    length_squared = np.sum(direction * direction, axis=-1, keepdims=True)
+    t = np.sum((points - a) * direction, axis=-1, keepdims=True) / np.where(length_squared > 0, length_squared, 1.0)
+    return np.linalg.norm(points - (a + np.clip(t, 0, 1) * direction), axis=-1)
+
+
+# Split coast.txt rows ([lon, lat]) into polylines at NaN rows and at gaps over max_gap metres
+def split_polylines(coast, max_gap=max_gap):
+    coast = np.asarray(coast, dtype=float)
+    gaps = np.linalg.norm(np.diff(ecef(coast[:, 1], coast[:, 0]), axis=0), axis=1)
+    breaks = np.flatnonzero(~(gaps <= max_gap)) + 1  # NaN rows give NaN gaps on both sides
+    return [piece for piece in np.split(coast, breaks) if len(piece) and not np.isnan(piece).any()]
+
+
+# Douglas-Peucker on one polyline; returns the kept vertices
+def simplify(polyline, tolerance=simplify_tolerance, max_segment=max_segment):
+    positions = ecef(polyline[:, 1], polyline[:, 0])
+    keep = np.zeros(len(polyline), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(polyline) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = chord_segment_distance(positions[first + 1:last], positions[first], positions[last])
+        split = first + 1 + int(np.argmax(distances))
+        too_long = np.linalg.norm(positions[last] - positions[first]) > max_segment
+        if distances.max() > tolerance or too_long:
+            keep[split] = True
+            stack.extend([(first, split), (split, last)])
+    return polyline[keep]
+
+
+# Insert points along every segment of a polyline so consecutive vertices are at most `spacing`
+# metres apart (interpolated along the great circle); used to build reference coastlines
+def densify(polyline, spacing):
+    positions = ecef(polyline[:, 1], polyline[:, 0])
+    pieces = []
+    for i in range(len(polyline) - 1):
+        steps = max(1, int(np.ceil(np.linalg.norm(positions[i + 1] - positions[i]) / spacing)))
+        t = np.arange(steps)[:, None] / steps
+        pieces.append((1 - t) * positions[i] + t * positions[i + 1])
+    pieces.append(positions[-1:])
+    return geodetic(np.vstack(pieces))
+
+
+# [lon, lat] in degrees of the ellipsoid surface point in the direction of each ECEF vector
+def geodetic(vectors):
+    geocentric = np.arctan2(vectors[..., 2], np.hypot(vectors[..., 0], vectors[..., 1]))
+    latitudes = np.degrees(np.arctan(np.tan(geocentric) / (1 - wgs84_e2)))
+    longitudes = np.degrees(np.arctan2(vectors[..., 1], vectors[..., 0]))
+    return np.stack([longitudes, latitudes], axis=-1)
+
+
+def unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+# Nearest point to q on the great-circle arc a-b (all unit vectors, broadcasting), as a unit vector
+def arc_foot(q, a, b):
+    normal = np.cross(a, b)
+    normal_length = np.linalg.norm(normal, axis=-1, keepdims=True)
+    normal = np.divide(normal, normal_length, out=np.zeros_like(normal), where=normal_length > 0)
+    projected = q - np.sum(q * normal, axis=-1, keepdims=True) * normal
+    projected_length = np.linalg.norm(projected, axis=-1, keepdims=True)
+    projected = np.divide(projected, projected_length, out=np.zeros_like(projected), where=projected_length > 0)
+    inside = ((np.sum(np.cross(a, projected) * normal, axis=-1) >= 0)
+              & (np.sum(np.cross(projected, b) * normal, axis=-1) >= 0)
+              & (normal_length[..., 0] > 0) & (projected_length[..., 0] > 0))
+    nearer_end = np.where((np.sum(q * a, axis=-1) >= np.sum(q * b, axis=-1))[..., None], a, b)
+    return np.where(inside[..., None], projected, nearer_end)
+
+
+# Split, simplify and cut coast.txt rows into segments; returns (start, end) arrays of [lon, lat]
+def build_segments(coast, tolerance=simplify_tolerance, max_gap=max_gap, max_segment=max_segment):
+    starts, ends = [], []
+    for polyline in split_polylines(coast, max_gap):
+        polyline = simplify(polyline, tolerance, max_segment)
+        if len(polyline) == 1:
+            polyline = np.vstack([polyline, polyline])  # A lone vertex is a zero-length segment
+        starts.append(polyline[:-1])
+        ends.append(polyline[1:])
+    return np.vstack(starts), np.vstack(ends)
+
+
+# Arrays the query needs besides the segment ends: unit vectors of both ends, ECEF midpoints for the
+# KD-tree, and the largest distance from a midpoint to any point of its segment's surface arc
+def segment_arrays(start, end):
+    a = ecef(start[:, 1], start[:, 0])
+    b = ecef(end[:, 1], end[:, 0])
+    chord = np.linalg.norm(b - a, axis=1)
+    # Half the chord plus the arc's sagitta, with a metre to spare
+    max_radius = float(np.max(chord / 2 + chord ** 2 / (8 * 6.3e6))) + 1.0
+    return {"start_unit": unit(a), "end_unit": unit(b), "midpoints": (a + b) / 2, "max_radius": np.array(max_radius)}
+
+
+class SegmentShoreDistance:
+    def __init__(self, start, end, arrays=None, block_size=2 ** 20, candidates=candidates):
+        self.start = start  # (segments, 2) as [lon, lat]
+        self.end = end
+        self.segment_count = len(start)
+        arrays = arrays if arrays is not None else segment_arrays(start, end)
+        self.start_unit = arrays["start_unit"]
+        self.end_unit = arrays["end_unit"]
+        self.max_radius = float(arrays["max_radius"])
+        self.midpoints = arrays["midpoints"]
+        # copy_data=False keeps the tree on the caller's (possibly memory-mapped) midpoints
+        self.tree = cKDTree(self.midpoints, copy_data=False)
+        self.block_size = block_size
+        self.candidates = candidates
+        self.candidate_evaluations = 0
+        self.geodesic_evaluations = 0
+
+    # Distance to coast in metres plus the nearest point on the coast, for arrays of coordinates
+    def query(self, latitudes, longitudes):
+        latitudes = np.asarray(latitudes, dtype=float).ravel()
+        longitudes = np.asarray(longitudes, dtype=float).ravel()
+        queries = ecef(latitudes, longitudes)
+        nearest = np.empty((len(queries), 2))
+        pending = np.arange(len(queries))
+        k = self.candidates
+        while len(pending):
+            k = min(k, self.segment_count)
+            unresolved = []
+            rows = max(1, self.block_size // k)
+            for start in range(0, len(pending), rows):
+                block = pending[start:start + rows]
+                chord, index = self.tree.query(queries[block], k)
+                chord, index = chord.reshape(len(block), k), index.reshape(len(block), k)
+
+                feet = geodetic(arc_foot(unit(queries[block])[:, None, :], self.start_unit[index], self.end_unit[index]))
+                approx = vincenty_distance(latitudes[block, None], longitudes[block, None], feet[..., 1], feet[..., 0])
+                self.candidate_evaluations += approx.size
+                best = np.argmin(approx, axis=1)
+                nearest[block] = feet[np.arange(len(block)), best]
+
+                # Segments outside the candidates are at least this far away along the ellipsoid
+                resolved = approx[np.arange(len(block)), best] <= chord[:, -1] - self.max_radius
+                unresolved.append(block[~resolved])
+            pending = np.concatenate(unresolved) if k < self.segment_count else pending[:0]
+            k *= 4
+
+        self.geodesic_evaluations += len(nearest)
+        distances = geodesic_distance(latitudes, longitudes, nearest[:, 1], nearest[:, 0])
+        return distances, nearest[:, 1], nearest[:, 0]
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import numpy
+
+from coast_index import open_segment_index, open_vertex_index
+
+# Measure to the nearest point on the simplified coast polylines rather than the nearest vertex.
+# Needs coast.txt vertices in order along each coastline (NaN rows or >20 km gaps between lines);
+# set False for an unordered point file.
+use_segments = True
+
+# Worker processes sharing the index and vessel arrays (Code/Data/parallel_enrichment.py), None for
+# one per core. Single-core machines and runs under parallel_enrichment.min_parallel_points vessels
+# are answered in this process, since they would only wait for the worker start-up
+workers = None
+
+# Same output as shore_distance_api.py, answered for every vessel in one bulk query. The index is
+# built once into coast.txt.segment-index (or .vertex-index), memory-mapped on later runs and
+# rebuilt automatically when coast.txt changes.
+if __name__ == '__main__':
+    coast = open_segment_index('coast.txt') if use_segments else open_vertex_index('coast.txt')
+    vessels = numpy.loadtxt('vessels.txt', ndmin=2)  # [lon, lat] rows
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+    from parallel_enrichment import parallel_shore_distance
+    distances, coast_latitudes, coast_longitudes = parallel_shore_distance(coast, vessels[:, 1], vessels[:, 0], workers)
+    print('vessel closest-coast dist')
+    for v, lat, lon, dist in zip(vessels, coast_latitudes, coast_longitudes, distances):
+        print(list(v), [lon, lat], dist)
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from mock_servers import serve_in_process
+
+# Load test for the enrichment scripts: drives NASA_API_v8 (wind speed) and GEBCO_v2 (ocean depth)
+# against the local POWER and Meteomatics stand-ins with 10k-1M synthetic projects, and reports
+# throughput, p50/p95/p99 request latency and peak memory. The stand-in and each run get their
+# own process so the server threads and earlier runs don't skew the timings or ru_maxrss.
+
+data_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(data_dir, "NASA API"))
+sys.path.append(os.path.join(data_dir, "Depth API"))
+
+installation_types = ["Onshore", "Offshore hard mount", "Offshore floating", "Offshore mount unknown"]
+
+
+# Synthetic projects with the RDS columns the enrichment scripts read, spread over Europe
+def synthetic_projects(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Entry ID": np.arange(1, count + 1),
+        "Installation Type": rng.choice(installation_types, count),
+        "Start year": rng.integers(1999, 2024, count),
+        "Latitude": np.round(rng.uniform(35.0, 71.0, count), 4),
+        "Longitude": np.round(rng.uniform(-11.0, 32.0, count), 4),
+    })
+
+
+# Milliseconds from a LatencyHistogram (within its 5% bucket width)
+def percentiles(latencies):
+    return {f"p{q}": latencies.percentile(q) * 1000 for q in (50, 95, 99)}
+
+
+# Peak resident set size of the calling process in MB (ru_maxrss is KB on Linux, bytes on macOS)
+def peak_memory_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_power(input_file, tmp, url, args):
+    import NASA_API_v8
+
+    start = time.perf_counter()
+    fetcher = asyncio.run(NASA_API_v8.run(input_file, os.path.join(tmp, "wind.csv"), url, args.max_in_flight,
+                                          args.rps, args.max_in_flight, os.path.join(tmp, "cache.sqlite"),
+                                          os.path.join(tmp, "store"), chunk_size=args.chunk_size))
+    return time.perf_counter() - start, fetcher.total_requests, fetcher.latencies
+
+
+# GEBCO_v2's depth job (onshore rows skipped, batched client) with its 50 requests per minute
+# limiter off; the stand-in enforces any rate limit
+def run_depth(input_file, tmp, url, args):
+    import GEBCO_v2
+
+    client = GEBCO_v2.client
+    client.base_url = url
+    client.limiter = None
+    client.max_points = args.depth_batch
+    start = time.perf_counter()
+    GEBCO_v2.run(input_file, os.path.join(tmp, "depth.csv"), mask_file=None)
+    return time.perf_counter() - start, client.http.request_count, client.latencies
+
+
+# Child process body: run one target with its chatter silenced and send the measurements back
+def run_scenario(target, input_file, url, args, connection):
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        run_target = run_power if target == "power" else run_depth
+        elapsed, request_count, latencies = run_target(input_file, tmp, url, args)
+    connection.send({"elapsed": elapsed, "requests": request_count, "peak_mb": peak_memory_mb(), **percentiles(latencies)})
+
+
+def start_stand_in(context, kind, config):
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=serve_in_process, args=(kind, sender, config), daemon=True)
+    process.start()
+    return process, receiver.recv()
+
+
+def report(target, project_count, result):
+    print(f"{target:<6} {project_count:>8} projects in {result['elapsed']:8.2f} s  ->  {project_count / result['elapsed']:9.1f} projects/s, "
+          f"{result['requests']:>7} requests, latency p50 {result['p50']:6.1f} ms  p95 {result['p95']:6.1f} ms  "
+          f"p99 {result['p99']:6.1f} ms, peak memory {result['peak_mb']:7.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the enrichment scripts against local POWER and Meteomatics stand-ins.")
+    parser.add_argument("--projects", type=int, nargs="+", default=[10_000], help="Synthetic project counts to run, e.g. 10000 100000 1000000")
+    parser.add_argument("--targets", nargs="+", choices=["power", "depth"], default=["power", "depth"])
+    parser.add_argument("--latency", type=float, default=0.01, help="Stand-in latency per request in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.01, help="Extra uniform random latency per request in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an injected 429/5xx")
+    parser.add_argument("--rate-limit", type=int, help="Requests the stand-in allows per --rate-window seconds")
+    parser.add_argument("--rate-window", type=float, default=1.0)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--rps", type=float, default=0, help="NASA_API_v8 requests per second budget (0 disables the limiter)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--depth-batch", type=int, default=200, help="Coordinates per Meteomatics request (1 for per-point requests)")
+    args = parser.parse_args()
+
+    # Spawned children start from a fresh interpreter, so ru_maxrss measures only the run itself
+    context = multiprocessing.get_context("spawn")
+    config = {"latency": args.latency, "latency_jitter": args.latency_jitter, "error_rate": args.error_rate,
+              "rate_limit": args.rate_limit, "rate_window": args.rate_window}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for project_count in args.projects:
+            input_file = os.path.join(tmp, f"projects_{project_count}.csv")
+            synthetic_projects(project_count).to_csv(input_file, index=False)
+
+            for target in args.targets:
+                server, url = start_stand_in(context, "power" if target == "power" else "meteomatics", config)
+                receiver, sender = context.Pipe(duplex=False)
+                worker = context.Process(target=run_scenario, args=(target, input_file, url, args, sender))
+                worker.start()
+                result = receiver.recv()
+                worker.join()
+                server.terminate()
+                report(target, project_count, result)
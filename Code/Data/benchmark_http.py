@@ -0,0 +1,41 @@
+import argparse
+import time
+
+import requests
+
+from http_client import PooledClient
+from mock_servers import start_power_server
+
+# Per-request latency of module-level requests.get (new connection every time) against the pooled
+# keep-alive client, both sending the same sequential requests to the local POWER stand-in.
+
+
+def params_for(i):
+    return {"start": 2010, "end": 2010, "latitude": 50 + (i % 20) * 0.5, "longitude": (i % 30) * 0.625,
+            "community": "ag", "parameters": "WS50M", "format": "json", "header": "true"}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-request latency with and without connection pooling.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in server latency per request in seconds")
+    args = parser.parse_args()
+
+    server, url = start_power_server(latency=args.latency)
+
+    start = time.perf_counter()
+    for i in range(args.requests):
+        requests.get(url, params=params_for(i), timeout=60)
+    elapsed = time.perf_counter() - start
+    print(f"requests.get   {elapsed / args.requests * 1000:6.2f} ms per request ({args.requests} connections)")
+
+    http = PooledClient()
+    start = time.perf_counter()
+    for i in range(args.requests):
+        http.get(url, params=params_for(i))
+    elapsed = time.perf_counter() - start
+    print(f"PooledClient   {elapsed / args.requests * 1000:6.2f} ms per request")
+    print(f"  {http.stats()}")
+
+    http.close()
+    server.shutdown()
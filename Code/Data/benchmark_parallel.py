@@ -0,0 +1,69 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from parallel_enrichment import min_parallel_points, parallel_shore_distance, pool_size
+from coast_index import open_segment_index
+from shore_engine import make_synthetic_coast
+
+# Scaling of the parallel shore-distance enrichment over a regular candidate grid (10^6 points by
+# default) around the synthetic coastline, with the persisted segment index: answered in this
+# process and then by 1, 2, 4, ... workers. Worker counts the pool can't win with (1, or any count
+# on a single-core machine) fall back to this process, which the report marks; a batch below
+# min_parallel_points does too. Parallel results must match the single-process ones exactly.
+
+
+def candidate_grid(points, lat_range=(48.0, 64.0), lon_range=(-12.0, 20.0)):
+    side = int(np.ceil(np.sqrt(points)))
+    latitudes, longitudes = np.meshgrid(np.linspace(*lat_range, side), np.linspace(*lon_range, side), indexing="ij")
+    return latitudes.ravel()[:points], longitudes.ravel()[:points]
+
+
+def report(label, elapsed, points, baseline=None):
+    line = f"{label:<22} {elapsed:8.2f} s  {points / elapsed:12,.0f} points/s"
+    if baseline is not None:
+        line += f"  speedup {baseline / elapsed:5.2f}x"
+    print(line)
+
+
+def worker_counts(limit):
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    return counts if counts[-1] == limit else counts + [limit]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure multiprocess shore-distance enrichment scaling.")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Largest worker count to run")
+    args = parser.parse_args()
+
+    latitudes, longitudes = candidate_grid(args.points)
+    print(f"{args.points:,} candidate points, {os.cpu_count()} cores")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        coast_file = os.path.join(tmp, "coast.txt")
+        np.savetxt(coast_file, make_synthetic_coast())
+        engine = open_segment_index(coast_file)
+
+        start = time.perf_counter()
+        expected = engine.query(latitudes, longitudes)
+        baseline = time.perf_counter() - start
+        report("in process", baseline, args.points)
+        for workers in worker_counts(args.workers):
+            start = time.perf_counter()
+            result = parallel_shore_distance(engine, latitudes, longitudes, workers)
+            fallback = " (in process)" if pool_size(args.points, workers) == 1 else ""
+            report(f"{workers} workers{fallback}", time.perf_counter() - start, args.points, baseline)
+            assert all(np.array_equal(a, b) for a, b in zip(result, expected))
+
+        # A small batch never waits for the pool, whatever the worker count
+        small = min_parallel_points // 10
+        start = time.perf_counter()
+        result = parallel_shore_distance(engine, latitudes[:small], longitudes[:small], max(args.workers, 2))
+        report(f"{small:,} points", time.perf_counter() - start, small)
+        assert all(np.array_equal(a, b[:small]) for a, b in zip(result, expected))
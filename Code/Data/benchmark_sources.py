@@ -0,0 +1,63 @@
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from data_sources import load, load_sheets, normalize, read_source, repo_dir, sources
+
+# Load times of the Data/ sources: parsing the original files (cold, what every run paid before),
+# the first load through data_sources (parse + convert to Parquet) and warm loads from the cache,
+# which must return the same frames as the normalized originals.
+
+# CSV exports the ML scripts used to read before they loaded the workbooks through data_sources
+ml_exports = {"RDS4ML": "Code/ML Model/RDS4ML.csv", "RDS5ML": "Code/ML Model/RDS5ML.csv"}
+
+
+# The cached workbook must match its CSV export: same columns, rows and dtypes once "Start year" is
+# coerced as the scripts do, and the same values up to the export's rounding (costs to whole pounds,
+# rates to 8 decimals)
+def check_ml_export(name, cache):
+    export = pd.read_csv(os.path.join(repo_dir, ml_exports[name]))
+    export["Start year"] = pd.to_numeric(export["Start year"], errors="coerce")
+    cached = load(name, cache_dir=cache)
+    pd.testing.assert_frame_equal(cached, export, check_exact=False, rtol=1e-6)
+    return len(cached), len(cached.columns)
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Excel/CSV parsing with cached Parquet loads of the Data/ sources.")
+    parser.add_argument("--sources", nargs="+", choices=list(sources), default=list(sources))
+    parser.add_argument("--repeats", type=int, default=5, help="Warm loads to average")
+    args = parser.parse_args()
+
+    print(f"{'source':<24} {'original':>10} {'convert':>10} {'warm':>10} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as cache:
+        total_cold = total_warm = 0.0
+        for name in args.sources:
+            start = time.perf_counter()
+            original = read_source(name)
+            cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            load_sheets(name, cache)
+            first = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                cached = load_sheets(name, cache)
+            warm = (time.perf_counter() - start) / args.repeats
+
+            for sheet, df in original.items():
+                pd.testing.assert_frame_equal(normalize(df, sources[name].get("numeric", [])), cached[sheet])
+            total_cold += cold
+            total_warm += warm
+            print(f"{name:<24} {cold * 1000:8.0f} ms {first * 1000:7.0f} ms {warm * 1000:7.1f} ms {cold / warm:8.0f}x")
+        print(f"{'all sources':<24} {total_cold * 1000:8.0f} ms {'':>10} {total_warm * 1000:7.1f} ms {total_cold / total_warm:8.0f}x")
+
+        for name in ml_exports:
+            if name in args.sources:
+                rows, columns = check_ml_export(name, cache)
+                print(f"{name} matches {ml_exports[name]}: {rows} rows, {columns} columns")
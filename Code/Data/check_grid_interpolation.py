@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Depth API"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "NASA API"))
+
+from gebco_grid import DepthGrid, make_synthetic_depth_grid, synthetic_depth
+from grid_interpolation import array_corners, bilinear
+from wind_grid import make_synthetic_grid, synthetic_wind_speed
+
+# Correctness checks for grid_interpolation.bilinear and the grids built on it (DepthGrid, WindGrid)
+# on small synthetic fields, runnable on their own in well under a second:
+#   python check_grid_interpolation.py
+# Fields linear in row and column must be reproduced exactly anywhere inside the grid, points past
+# an edge are NaN, and global grids wrap across the antimeridian. The benchmarks call the grid
+# checks on the grids they time (benchmark_depth.py also on its memory-mapped copy).
+
+
+# Stand-in for a lazy NetCDF variable: not an ndarray, only supports slicing, records what was read
+class LazyField:
+    def __init__(self, values):
+        self.values = values
+        self.shape = values.shape
+        self.reads = []
+
+    def __getitem__(self, key):
+        self.reads.append(key)
+        return self.values[key]
+
+
+def check_bilinear():
+    rows, cols = 7, 11
+    field = 1.0 + 3.0 * np.arange(rows)[:, None] + 5.0 * np.arange(cols)[None, :]
+    read = array_corners(field)
+    rng = np.random.default_rng(0)
+
+    # Exact inside, including the last row and column, and on the nodes
+    row = np.concatenate([rng.uniform(0, rows - 1, 1000), [0, rows - 1, rows - 1, 2]])
+    col = np.concatenate([rng.uniform(0, cols - 1, 1000), [0, cols - 1, 0, 4]])
+    assert np.allclose(bilinear(row, col, field.shape, read), 1.0 + 3.0 * row + 5.0 * col, rtol=0, atol=1e-9)
+    assert bilinear([2.0], [4.0], field.shape, read)[0] == field[2, 4]
+
+    # NaN just past every edge, without disturbing the points that are inside
+    row = np.array([-1e-9, rows - 1 + 1e-9, 3.0, 3.0, 3.0])
+    col = np.array([5.0, 5.0, -1e-9, cols - 1 + 1e-9, 5.0])
+    result = bilinear(row, col, field.shape, read)
+    assert np.isnan(result[:4]).all() and result[4] == field[3, 5]
+    assert np.isnan(bilinear([np.nan], [1.0], field.shape, read)).all()
+
+    # Wrapped grids: the last column neighbours the first, and columns are taken modulo the width
+    result = bilinear([3.0, 3.0, 3.0, 3.0], [cols - 0.5, cols, -0.5, 4.0 + cols], field.shape, read, wraps=True)
+    assert result[0] == (field[3, -1] + field[3, 0]) / 2
+    assert result[1] == field[3, 0]
+    assert result[2] == result[0]
+    assert result[3] == field[3, 4]
+    assert np.isnan(bilinear([rows], [1.0], field.shape, read, wraps=True)).all()
+
+    # Layered fields read each point's own layer
+    layered = np.stack([field, 2 * field])
+    result = bilinear([1.5, 1.5], [2.5, 2.5], field.shape, array_corners(layered, np.array([0, 1])))
+    assert result[1] == 2 * result[0] == 2 * (1.0 + 3.0 * 1.5 + 5.0 * 2.5)
+
+
+def check_depth_grid(grid=None, label="in-memory depth grid", count=10_000):
+    grid = make_synthetic_depth_grid() if grid is None else grid
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(grid.lat_min, grid.lat_min + (grid.rows - 1) * grid.step, count)
+    longitudes = rng.uniform(grid.lon_min, grid.lon_min + (grid.cols - 1) * grid.step, count)
+    error = np.max(np.abs(grid.depth(latitudes, longitudes) - synthetic_depth(grid, latitudes, longitudes)))
+    assert error < 1e-6, f"{label}: interpolation error {error}"
+
+    # Exact values on the grid nodes, and NaN outside the grid
+    assert grid.depth([grid.lat_min], [grid.lon_min])[0] == 0.0
+    assert np.isclose(grid.depth([grid.lat_min + grid.step], [grid.lon_min + 2 * grid.step])[0], 16.0)
+    assert np.isnan(grid.depth([grid.lat_min - grid.step], [grid.lon_min])).all()
+    assert np.isnan(grid.depth([grid.lat_min + grid.rows * grid.step], [grid.lon_min])).all()
+    assert np.isnan(grid.depth([grid.lat_min], [grid.lon_min + grid.cols * grid.step])).all()
+    return error
+
+
+def check_depth_wrap():
+    # Four 90 degree columns centred on -135, -45, 45 and 135: a global grid
+    elevation = np.array([[-100, -200, -300, -400]] * 2, dtype=np.int16)
+    for field in (elevation, LazyField(elevation)):
+        grid = DepthGrid(field, -0.5, -135.0, 90.0)
+        assert grid.wraps
+        # East of the last column interpolates towards the first, from either side of the antimeridian
+        assert grid.depth([0.0], [180.0])[0] == 250.0
+        assert grid.depth([0.0], [-180.0])[0] == 250.0
+        assert grid.depth([0.0, 0.0], [-135.0, 225.0]).tolist() == [100.0, 100.0]
+        assert np.isnan(grid.depth([90.0], [0.0])).all()
+
+    # A regional grid does not wrap: past its last column is outside
+    regional = DepthGrid(elevation, -0.5, -135.0, 45.0)
+    assert not regional.wraps and np.isnan(regional.depth([0.0], [180.0])).all()
+
+    # Land is depth 0, and lazy fields only read the window around the points
+    grid = DepthGrid(LazyField(-make_synthetic_depth_grid().elevation), 34.0, -25.0, 0.05)
+    assert grid.depth([34.5], [-24.5])[0] == 0.0
+    (rows, cols), = grid.elevation.reads
+    assert rows.stop - rows.start == 2 and cols.stop - cols.start == 2
+
+
+def check_wind_grid(grid=None, count=2_000):
+    grid = make_synthetic_grid() if grid is None else grid
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(grid.latitudes[0], grid.latitudes[-1], count)
+    longitudes = rng.uniform(grid.longitudes[0], grid.longitudes[-1], count)
+    years = rng.choice(grid.years, count)
+    error = np.max(np.abs(grid.interpolate(latitudes, longitudes, years) - synthetic_wind_speed(latitudes, longitudes, years)))
+    assert error < 1e-9, f"wind grid: interpolation error {error}"
+
+    # Years the grid doesn't hold and points outside it are NaN
+    inside = (grid.latitudes[0], grid.longitudes[0])
+    assert np.isnan(grid.interpolate([inside[0]], [inside[1]], [grid.years[-1] + 1])).all()
+    assert np.isnan(grid.interpolate([inside[0]], [inside[1]], [grid.years[0] - 1])).all()
+    assert np.isnan(grid.interpolate([grid.latitudes[-1] + 0.01], [inside[1]], [grid.years[0]])).all()
+    assert np.isnan(grid.interpolate([inside[0]], [grid.longitudes[0] - 0.01], [grid.years[0]])).all()
+    return error
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    check_bilinear()
+    depth_error = check_depth_grid()
+    check_depth_wrap()
+    wind_error = check_wind_grid()
+    print(f"Grid interpolation checks passed in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"(max error: depth {depth_error:.1e} m, wind {wind_error:.1e} m/s)")
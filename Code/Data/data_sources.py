@@ -0,0 +1,128 @@
+import numbers
+import os
+
+import pandas as pd
+
+from file_manifest import manifest_is_current, read_manifest, start_build, write_manifest
+
+# Cached columnar copies of the source files in Data/. Parsing the workbooks with read_excel takes
+# seconds per file (Revised Data Set 5.xlsx alone ~4.5 s) and happens at the start of every run,
+# so each source is converted once to Parquet with explicit dtypes, one file per sheet, and later
+# loads read the Parquet files:
+#   Data/.cache/<source>/manifest.json, 0.parquet, 1.parquet, ...
+#
+# The manifest (file_manifest.py) records the source's size, mtime and SHA-256, the settings it
+# was converted with and each sheet's original column labels (year columns are ints in the
+# workbooks; Parquet only stores strings), and a changed source is converted again automatically.
+#
+# Dtypes: columns listed under "numeric" are coerced to numbers (placeholders such as "?" and "-"
+# become NaN, as the ML scripts do after loading); other object columns become numbers when every
+# value is a number, and strings otherwise.
+
+repo_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+data_dir = os.path.join(repo_dir, "Data")
+cache_dir = os.path.join(data_dir, ".cache")
+
+cache_version = 1
+
+# Source name -> file in Data/, extra read_excel / read_csv arguments, and columns coerced to numbers
+sources = {
+    "Revised Data Set 5": {"file": "Revised Data Set 5.xlsx", "numeric": ["Start year"]},
+    "RDS4ML": {"file": "RDS4ML.xlsx", "numeric": ["Start year"]},
+    "RDS5ML": {"file": "RDS5ML.xlsx", "numeric": ["Start year"]},
+    "GDP Growth Rate": {"file": "GDP Growth Rate.csv", "read": {"skiprows": 4}},
+    # xlrd rejects this export's (harmless) compound-document quirks unless told to ignore them
+    "Government Debt Ratio": {"file": "Government Debt Ratio.xls", "read": {
+        "na_values": ["no data"], "engine_kwargs": {"ignore_workbook_corruption": True}}},
+    "Windfarm Costs": {"file": "Windfarm Costs.xlsx"},
+    "Credit Scale": {"file": "Credit Scale.xlsx"},
+}
+
+
+def source_path(name):
+    return os.path.join(data_dir, sources[name]["file"])
+
+
+# Parse the original file: every sheet of a workbook, or a CSV as a single sheet named "data"
+def read_source(name):
+    source = sources[name]
+    path = source_path(name)
+    read = dict(source.get("read", {}))
+    if path.endswith(".csv"):
+        return {"data": pd.read_csv(path, **read)}
+    with open(os.devnull, "w") as devnull:
+        if path.endswith(".xls"):
+            # xlrd reports every ignored quirk on stdout
+            read["engine_kwargs"] = {**read.get("engine_kwargs", {}), "logfile": devnull}
+        return pd.read_excel(path, sheet_name=None, **read)
+
+
+# Give every column an explicit Parquet-friendly dtype
+def normalize(df, numeric=()):
+    df = df.copy()
+    for column in df.columns:
+        if column in numeric:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+        elif df[column].dtype == object:
+            values = df[column].dropna()
+            if len(values) and all(isinstance(v, numbers.Number) and not isinstance(v, bool) for v in values):
+                df[column] = pd.to_numeric(df[column])
+            else:
+                df[column] = df[column].astype("string")
+    return df
+
+
+def settings(name):
+    source = sources[name]
+    return {"read": source.get("read", {}), "numeric": source.get("numeric", [])}
+
+
+# True when the cache at `path` was converted from the current source with the current settings
+def cache_is_current(path, name):
+    return manifest_is_current(path, source_path(name), {"version": cache_version, "settings": settings(name)})
+
+
+# Convert every sheet of a source to Parquet under `path`
+def convert(name, path):
+    start_build(path)
+    sheets = []
+    for i, (sheet, df) in enumerate(read_source(name).items()):
+        df = normalize(df, sources[name].get("numeric", []))
+        columns = [[column, "int" if isinstance(column, numbers.Integral) else "str"] for column in df.columns]
+        df.columns = [str(column) for column in df.columns]
+        df.to_parquet(os.path.join(path, f"{i}.parquet"), index=False)
+        sheets.append({"name": sheet, "file": f"{i}.parquet", "columns": columns})
+    write_manifest(path, source_path(name), {"version": cache_version, "source": sources[name]["file"],
+                                             "settings": settings(name), "sheets": sheets})
+
+
+# Cache directory and manifest of a source, converting it first if the cache is missing or stale
+def open_cache(name, cache_dir=cache_dir):
+    path = os.path.join(cache_dir, name)
+    if not cache_is_current(path, name):
+        print(f"Converting {sources[name]['file']} to Parquet in {path}")
+        convert(name, path)
+    return path, read_manifest(path)
+
+
+def read_sheet(path, sheet):
+    df = pd.read_parquet(os.path.join(path, sheet["file"]))
+    df.columns = [int(column) if kind == "int" else column for column, kind in sheet["columns"]]
+    return df
+
+
+# Every sheet of a source as {sheet name: DataFrame}
+def load_sheets(name, cache_dir=cache_dir):
+    path, manifest = open_cache(name, cache_dir)
+    return {sheet["name"]: read_sheet(path, sheet) for sheet in manifest["sheets"]}
+
+
+# One sheet of a source (the first by default), e.g. load("Revised Data Set 5", "Projects")
+def load(name, sheet=None, cache_dir=cache_dir):
+    path, manifest = open_cache(name, cache_dir)
+    sheets = {entry["name"]: entry for entry in manifest["sheets"]}
+    if sheet is None:
+        return read_sheet(path, manifest["sheets"][0])
+    if sheet not in sheets:
+        raise KeyError(f"{sources[name]['file']} has no sheet {sheet!r}; sheets: {list(sheets)}")
+    return read_sheet(path, sheets[sheet])
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+
+# Manifest for files derived from a source file (the persisted coastline index, the Parquet cache of
+# the Data/ sources). manifest.json in the derived directory records the source's size, mtime and
+# SHA-256 next to the caller's own fields (format version, build settings, ...). It is written last
+# and atomically, and removed before a rebuild starts, so a half-written directory is never
+# trusted; when the size or mtime differ the hash decides whether the source really changed.
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(path):
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(path, source_path, fields, sha256=None):
+    stat = os.stat(source_path)
+    manifest = {**fields, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                "sha256": sha256 or file_sha256(source_path)}
+    temporary = os.path.join(path, "manifest.json.tmp")
+    with open(temporary, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temporary, os.path.join(path, "manifest.json"))
+
+
+# True when the manifest at `path` has every field in `expected` and describes the current source
+def manifest_is_current(path, source_path, expected):
+    manifest = read_manifest(path)
+    if manifest is None or any(manifest.get(key) != value for key, value in expected.items()):
+        return False
+    stat = os.stat(source_path)
+    if manifest["size"] == stat.st_size and manifest["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    # Touched or copied but possibly unchanged: the content hash decides, and a match refreshes the manifest
+    if manifest["size"] != stat.st_size or manifest["sha256"] != file_sha256(source_path):
+        return False
+    write_manifest(path, source_path, manifest, manifest["sha256"])
+    return True
+
+
+# Create the derived directory and drop its manifest, so a crash mid-build leaves it rebuilt, not trusted
+def start_build(path):
+    os.makedirs(path, exist_ok=True)
+    if os.path.exists(os.path.join(path, "manifest.json")):
+        os.remove(os.path.join(path, "manifest.json"))
@@ -0,0 +1,60 @@
+import numpy as np
+
+# Vectorized bilinear interpolation on regular grids, shared by the wind speed grid
+# (NASA API/wind_grid.py), the GEBCO depth grid (Depth API/gebco_grid.py) and the distance-to-coast
+# raster (Shore Distance/Shore_Distance/coast_raster.py). Callers turn coordinates into fractional
+# (row, col) grid positions in their own projection; the corner values are read through a callback
+# so memory-mapped, lazily loaded and layered (e.g. per-year) fields all share the same arithmetic.
+
+
+# Corner reader for an ndarray or np.memmap field of shape (rows, cols), or (layers, rows, cols)
+# with `layers` giving each point's layer. np.memmap fancy indexing only touches the pages holding
+# the requested cells.
+def array_corners(field, layers=None):
+    def read(inside, row0, col0, col1):
+        index = () if layers is None else (np.asarray(layers)[inside],)
+        return [field[index + (row0, col0)], field[index + (row0, col1)],
+                field[index + (row0 + 1, col0)], field[index + (row0 + 1, col1)]]
+    return read
+
+
+# Bilinear interpolation at fractional grid positions `row`, `col` on a grid of `shape` (rows, cols),
+# NaN outside the grid. read_corners(inside, row0, col0, col1) returns the values at (row0, col0),
+# (row0, col1), (row0 + 1, col0) and (row0 + 1, col1) for the points selected by `inside`. With
+# wraps=True the last column neighbours the first (global grids across the antimeridian).
+def bilinear(row, col, shape, read_corners, wraps=False):
+    rows, cols = shape
+    row = np.asarray(row, dtype=float)
+    col = np.asarray(col, dtype=float)
+    if wraps:
+        col = np.mod(col, cols)
+    inside = (row >= 0) & (row <= rows - 1) & (col >= 0) & (col <= (cols if wraps else cols - 1))
+    result = np.full(row.shape, np.nan)
+    if not inside.any():
+        return result
+
+    # Lower-left corner of each point's cell, kept one short of the edge so +1 stays in range
+    row, col = row[inside], col[inside]
+    row0 = np.clip(np.floor(row).astype(np.int64), 0, rows - 2)
+    col0 = np.clip(np.floor(col).astype(np.int64), 0, cols - (1 if wraps else 2))
+    dy = row - row0
+    dx = col - col0
+    col1 = (col0 + 1) % cols if wraps else col0 + 1
+
+    corners = [np.asarray(corner, dtype=float) for corner in read_corners(inside, row0, col0, col1)]
+    result[inside] = (
+        corners[0] * (1 - dy) * (1 - dx)
+        + corners[1] * (1 - dy) * dx
+        + corners[2] * dy * (1 - dx)
+        + corners[3] * dy * dx
+    )
+    return result
+
+
+# NetCDF support is optional, only needed for grids in the formats GEBCO and other sources distribute
+def open_netcdf(path):
+    try:
+        import xarray
+    except ImportError:
+        raise ImportError("Reading NetCDF grids requires xarray (pip install xarray netCDF4)")
+    return xarray.open_dataset(path)
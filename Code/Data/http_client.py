@@ -0,0 +1,105 @@
+import math
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared HTTP client for the enrichment scripts (NASA POWER, Meteomatics). Module-level
+# requests.get opens a fresh TCP/TLS connection for every point; this keeps connections alive in
+# a pool, caps concurrent requests per host, applies one timeout everywhere, and reports how often
+# connections were reused and what that did to per-request latency.
+
+
+class PooledClient:
+    def __init__(self, timeout=60, max_per_host=4, pool_hosts=10):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=max_per_host)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+        self.host_limits = {}  # host -> semaphore bounding concurrent requests
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.new_connection_requests = 0
+        self.new_connection_seconds = 0.0
+        self.reused_connection_seconds = 0.0
+
+    def host_limit(self, host):
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.host_limits[host]
+
+    # Total connections opened so far across every host's pool
+    def connections_opened(self):
+        pools = self.adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in list(pools.keys()))
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        with self.host_limit(urlparse(url).hostname):
+            opened_before = self.connections_opened()
+            start = time.perf_counter()
+            try:
+                return self.session.get(url, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                # Concurrent requests can blur which one opened a connection; the totals stay right
+                opened_connection = self.connections_opened() > opened_before
+                with self.lock:
+                    self.request_count += 1
+                    if opened_connection:
+                        self.new_connection_requests += 1
+                        self.new_connection_seconds += elapsed
+                    else:
+                        self.reused_connection_seconds += elapsed
+
+    def stats(self):
+        reused = self.request_count - self.new_connection_requests
+        new_latency = self.new_connection_seconds / self.new_connection_requests if self.new_connection_requests else 0.0
+        reused_latency = self.reused_connection_seconds / reused if reused else 0.0
+        reuse_rate = reused / self.request_count if self.request_count else 0.0
+        return (f"{self.request_count} requests over {self.connections_opened()} connections "
+                f"({reuse_rate:.1%} reused), mean latency {new_latency * 1000:.1f} ms on new connections, "
+                f"{reused_latency * 1000:.1f} ms on reused ones")
+
+    def close(self):
+        self.session.close()
+
+
+# Request latencies in fixed log-spaced buckets (each 5% wider than the last, 0.1 ms to 10 min), so
+# p50/p99 reporting takes the same few kilobytes however many requests a run makes
+class LatencyHistogram:
+    def __init__(self, min_seconds=1e-4, max_seconds=600.0, growth=1.05):
+        self.min_seconds = min_seconds
+        self.growth = growth
+        self.counts = [0] * (math.ceil(math.log(max_seconds / min_seconds, growth)) + 2)
+        self.count = 0
+        self.total_seconds = 0.0
+
+    # Bucket 0 holds everything up to min_seconds, bucket b > 0 (min * growth^(b-1), min * growth^b],
+    # and the last bucket everything beyond max_seconds
+    def record(self, seconds):
+        bucket = 0
+        if seconds > self.min_seconds:
+            bucket = min(len(self.counts) - 1, 1 + int(math.log(seconds / self.min_seconds, self.growth)))
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_seconds += seconds
+
+    # Latency in seconds below which `q` percent of the requests fell, to within one bucket
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        # Geometric middle of the bucket
+        return self.min_seconds * self.growth ** max(bucket - 0.5, 0)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from data_sources import load
+
+# Macro-indicator join for projects. Each indicator is a country x year table (one row per
+# country, one column per year); they are stacked into a single (indicators, countries, years)
+# array over a shared country index and year axis, so attaching every indicator to every project
+# is one integer-indexed gather: the project's country row and its start year (minus any lag)
+# column.
+#
+# Country names are matched case-insensitively; unknown countries, missing start years and years
+# before an indicator's first column give NaN. Past an indicator's last year its latest column
+# carries forward, which is how the RDS5 project columns were assembled (2024 starts took the
+# 2023 figures), so lag 0 reproduces them.
+
+# Project column -> (data_sources source, sheet) of its country x year table
+indicators = {
+    "Inflation in Project Country (HCPI)": ("Revised Data Set 5", "HCP Inflation Data"),
+    "Energy Inflation in Project Country (EPI)": ("Revised Data Set 5", "EP Inflation Data"),
+    "Government Debt as Percentage of GDP": ("Revised Data Set 5", "Government Debt Data"),
+    "Country GDP Growth Rate": ("Revised Data Set 5", "GDP Growth Rate Data"),
+    "Country Credit Rating": ("Revised Data Set 5", "Rating Data"),
+}
+
+
+def country_key(names):
+    return pd.Index(names, dtype=object).str.strip().str.lower()
+
+
+class MacroFeatures:
+    # tables: {indicator: DataFrame with country names in the first column and int year columns}
+    def __init__(self, tables):
+        self.names = list(tables)
+        years = sorted({column for df in tables.values() for column in df.columns[1:]})
+        self.first_year, last_year = years[0], years[-1]
+        self.countries = pd.Index(sorted(set().union(*(country_key(df.iloc[:, 0].dropna()) for df in tables.values()))))
+
+        self.values = np.full((len(tables), len(self.countries), last_year - self.first_year + 1), np.nan)
+        for i, df in enumerate(tables.values()):
+            df = df.dropna(subset=[df.columns[0]])
+            table_years = np.asarray(df.columns[1:], dtype=np.int64)
+            rows = self.countries.get_indexer(country_key(df.iloc[:, 0]))
+            self.values[i][np.ix_(rows, table_years - self.first_year)] = df.iloc[:, 1:].to_numpy(dtype=float)
+            # Later years carry the table's last column forward
+            self.values[i, rows, table_years.max() - self.first_year + 1:] = self.values[i, rows, table_years.max() - self.first_year][:, None]
+
+    # Positions of each project's country row (-1 if unknown)
+    def country_rows(self, countries):
+        # Normalize each distinct name once rather than every project
+        codes, names = pd.factorize(np.asarray(countries, dtype=object))
+        rows = self.countries.get_indexer(country_key(names))[codes]
+        rows[codes < 0] = -1
+        return rows
+
+    # Indicator values for paired arrays of countries and years as a (projects, indicators) array,
+    # taking each indicator at year - lag
+    def gather(self, countries, years, lag=0, rows=None):
+        rows = self.country_rows(countries) if rows is None else rows
+        years = np.asarray(years, dtype=float) - lag
+        column = np.minimum(np.nan_to_num(years - self.first_year, nan=-1), self.values.shape[2] - 1).astype(np.int64)
+        found = (rows >= 0) & (column >= 0)
+        result = self.values[:, np.where(found, rows, 0), np.where(found, column, 0)].T
+        result[~found] = np.nan
+        return result
+
+    # Macro columns for a projects table: each indicator as named in `indicators`, plus
+    # "<name> (lag k)" columns for every non-zero lag
+    def attach(self, projects, lags=(0,), country_column="Country", year_column="Start year"):
+        rows = self.country_rows(projects[country_column])
+        years = pd.to_numeric(projects[year_column], errors="coerce").to_numpy(dtype=float)
+        columns = {}
+        for lag in lags:
+            values = self.gather(None, years, lag, rows)
+            for i, name in enumerate(self.names):
+                columns[name if lag == 0 else f"{name} (lag {lag})"] = values[:, i]
+        return pd.DataFrame(columns, index=projects.index)
+
+
+# Engine over the indicator tables in Data/ (through the Parquet cache)
+def load_macro_features(indicators=indicators):
+    return MacroFeatures({name: load(source, sheet) for name, (source, sheet) in indicators.items()})
@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+from collections import deque
+
+import requests
+
+from http_client import LatencyHistogram, PooledClient
+
+# The retry policy (and its retryable statuses) is shared with the NASA POWER fetcher
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "NASA API"))
+from resilience import RetryPolicy
+
+# Batched Meteomatics client for the depth scripts. The API accepts several coordinates in one
+# request path (lat,lon+lat,lon+...), so points are packed into each request up to a point count
+# and URL length limit, the multi-row CSV reply is mapped back to the caller's keys, calls are
+# spaced by a sliding-window limiter (at most N requests in any window, rather than a fixed sleep
+# every N rows), and points that fail are retried with backoff instead of being dropped.
+
+# Meteomatics basic plan: 50 requests per minute
+requests_per_window = 50
+window_seconds = 60.0
+
+
+# At most `max_requests` calls in any `window` seconds
+class SlidingWindowLimiter:
+    def __init__(self, max_requests, window):
+        self.max_requests = max_requests
+        self.window = window
+        self.sent = deque()
+        self.waited = 0.0
+
+    def acquire(self):
+        now = time.monotonic()
+        while self.sent and self.sent[0] <= now - self.window:
+            self.sent.popleft()
+        if len(self.sent) >= self.max_requests:
+            # Wait until the oldest call in the window ages out
+            delay = self.sent[0] + self.window - now
+            time.sleep(delay)
+            self.waited += delay
+            self.sent.popleft()
+        self.sent.append(time.monotonic())
+
+
+def format_coordinate(value):
+    return repr(round(float(value), 6))
+
+
+class MeteomaticsClient:
+    def __init__(self, base_url, validdate, parameter="ocean_depth:m", http=None, max_points=200,
+                 max_url_length=4000, requests_per_window=requests_per_window, window_seconds=window_seconds,
+                 retry=None):
+        self.base_url = base_url
+        self.validdate = validdate
+        self.parameter = parameter
+        self.http = http or PooledClient(timeout=60, max_per_host=1)
+        self.max_points = max_points
+        self.max_url_length = max_url_length
+        # None disables the limiter, e.g. against a local stand-in
+        self.limiter = SlidingWindowLimiter(requests_per_window, window_seconds) if requests_per_window else None
+        self.retry = retry or RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=60.0)
+        self.latencies = LatencyHistogram()  # Seconds per request
+        self.retries = 0
+
+    def url_for(self, points):
+        locations = "+".join(f"{format_coordinate(lat)},{format_coordinate(lon)}" for lat, lon in points)
+        return f"{self.base_url}/{self.validdate}/{self.parameter}/{locations}/csv"
+
+    # Split points into batches bounded by max_points and max_url_length
+    def batches(self, points):
+        batch = []
+        length = len(self.url_for([]))
+        for point in points:
+            point_length = len(format_coordinate(point[0])) + len(format_coordinate(point[1])) + 2
+            if batch and (len(batch) >= self.max_points or length + point_length > self.max_url_length):
+                yield batch
+                batch = []
+                length = len(self.url_for([]))
+            batch.append(point)
+            length += point_length
+        if batch:
+            yield batch
+
+    # One request for a batch of points; returns ({point: value}, failure status or None, Retry-After)
+    def fetch_batch(self, points):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = self.http.get(self.url_for(points))
+        except requests.RequestException as e:
+            return {}, type(e).__name__, None
+        finally:
+            self.latencies.record(time.perf_counter() - start)
+
+        if response.status_code != 200:
+            return {}, response.status_code, response.headers.get("Retry-After")
+
+        values = {}
+        rows = [line.split(";") for line in response.text.splitlines()[1:] if line]
+        if len(points) == 1 and rows and len(rows[0]) == 2:
+            # A single coordinate replies without lat;lon columns
+            rows = [[points[0][0], points[0][1]] + rows[0]]
+        # Rows come back in request order; check the echoed coordinates before trusting a value
+        for point, row in zip(points, rows):
+            try:
+                if abs(float(row[0]) - point[0]) > 1e-4 or abs(float(row[1]) - point[1]) > 1e-4:
+                    continue
+                values[point] = float(row[-1])
+            except (ValueError, IndexError):
+                continue
+        return values, None, None
+
+    # Values for every key: returns ({key: value}, {key: last failure status}) so nothing is silently lost.
+    # Keys sharing a coordinate (multi-phase projects) are requested once.
+    def fetch(self, keys, latitudes, longitudes):
+        keys_by_point = {}
+        for key, lat, lon in zip(keys, latitudes, longitudes):
+            keys_by_point.setdefault((round(float(lat), 6), round(float(lon), 6)), []).append(key)
+
+        values = {}
+        failures = {}
+        pending = list(keys_by_point)
+        retry_after = None
+        for attempt in range(self.retry.max_attempts):
+            if not pending:
+                break
+            if attempt > 0:
+                self.retries += len(pending)
+                time.sleep(self.retry.delay(attempt - 1, retry_after))
+
+            retry = []
+            retry_after = None
+            for batch in self.batches(pending):
+                batch_values, status, batch_retry_after = self.fetch_batch(batch)
+                retry_after = batch_retry_after or retry_after
+                for point in batch:
+                    if point in batch_values:
+                        values[point] = batch_values[point]
+                        failures.pop(point, None)
+                    else:
+                        failures[point] = status or "missing from reply"
+                        # Client errors other than 429 (bad credentials, malformed request) fail the same way on every retry
+                        if self.retry.should_retry(failures[point]):
+                            retry.append(point)
+                if status is not None:
+                    print(f"Depth request for {len(batch)} points failed (attempt {attempt + 1} of {self.retry.max_attempts}). Status: {status}")
+            pending = retry
+
+        results = {key: value for point, value in values.items() for key in keys_by_point[point]}
+        failed = {key: status for point, status in failures.items() for key in keys_by_point[point]}
+        return results, failed
@@ -0,0 +1,268 @@
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-ins for the NASA POWER monthly point endpoint and the Meteomatics ocean depth
+# endpoint, used to benchmark the enrichment scripts without hitting the real APIs and their
+# rate limits. Both servers share configurable latency, injected 429/5xx errors, outage windows
+# and a sliding-window rate limit.
+
+POWER_PATH = "/api/temporal/monthly/point"
+
+
+# Deterministic fake wind speed for a location, year and month so repeated runs compare equal
+def fake_wind_speed(latitude, longitude, year, month):
+    base = 6.0 + 3.0 * abs(math.sin(math.radians(latitude * 3.0))) + 0.5 * math.cos(math.radians(longitude * 5.0))
+    seasonal = 1.2 * math.cos(2 * math.pi * (month - 1) / 12.0)
+    trend = 0.01 * (year - 2000)
+    return round(base + seasonal + trend, 2)
+
+
+# Fake monthly value for any supported POWER parameter
+def fake_parameter(parameter, latitude, longitude, year, month):
+    if parameter == "WS50M":
+        return fake_wind_speed(latitude, longitude, year, month)
+    if parameter == "WS10M":
+        return round(0.78 * fake_wind_speed(latitude, longitude, year, month), 2)
+    if parameter == "WD50M":
+        return round((220 + 40 * math.sin(2 * math.pi * month / 12.0) + longitude) % 360, 2)
+    return -999.0  # POWER's fill value for unavailable data
+
+
+# Deterministic fake ocean depth in metres
+def fake_depth(latitude, longitude):
+    return round(20.0 + 180.0 * abs(math.sin(math.radians(latitude * 7.0)) * math.cos(math.radians(longitude * 11.0))), 2)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive so clients can reuse connections
+    disable_nagle_algorithm = True  # Headers and body are separate writes; avoid delayed-ACK stalls on reused connections
+
+    # Apply latency, rate limiting and injected failures; returns True when an error was sent
+    def apply_faults(self):
+        server = self.server
+        server.count_arrival()
+        if server.latency or server.latency_jitter:
+            time.sleep(server.latency + server.random.uniform(0, server.latency_jitter))
+
+        if not server.allow_request():
+            self.send_body(429, "Rate limit exceeded", "text/plain", {"Retry-After": str(math.ceil(server.rate_window))})
+            return True
+        if time.monotonic() < server.outage_until:
+            server.error_count += 1
+            self.send_body(503, "Service unavailable", "text/plain")
+            return True
+        if server.error_rate and server.random.random() < server.error_rate:
+            status = server.random.choice(server.error_statuses)
+            server.error_count += 1
+            self.send_body(status, "Injected error", "text/plain", {"Retry-After": "1"} if status == 429 else None)
+            return True
+        if server.malformed_rate and server.random.random() < server.malformed_rate:
+            # A gateway error page served as 200, as proxies in front of POWER occasionally do
+            server.error_count += 1
+            self.send_body(200, "<html><body>Service temporarily unavailable</body></html>", "text/html")
+            return True
+        return False
+
+    def send_body(self, status, body, content_type, headers=None):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, payload, headers=None):
+        self.send_body(status, json.dumps(payload), "application/json", headers)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+class PowerHandler(MockHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != POWER_PATH:
+            self.send_json(404, {"messages": ["Not found"]})
+            return
+
+        query = parse_qs(url.query)
+        try:
+            latitude = float(query["latitude"][0])
+            longitude = float(query["longitude"][0])
+            start = int(query["start"][0])
+            end = int(query["end"][0])
+        except (KeyError, ValueError):
+            self.send_json(422, {"messages": ["Missing or invalid parameters"]})
+            return
+
+        if self.apply_faults():
+            return
+
+        parameters = {}
+        for parameter in query.get("parameters", ["WS50M"])[0].split(","):
+            values = {}
+            for year in range(start, end + 1):
+                monthly = [fake_parameter(parameter, latitude, longitude, year, month) for month in range(1, 13)]
+                for month, value in enumerate(monthly, start=1):
+                    values[f"{year}{month:02d}"] = value
+                values[f"{year}13"] = round(sum(monthly) / 12.0, 2)
+            parameters[parameter] = values
+
+        self.server.count_request()
+        self.send_json(200, {"properties": {"parameter": parameters}})
+
+
+# Meteomatics path format: /{validdate}/ocean_depth:m/{lat},{lon}[+{lat},{lon}...]/csv. One coordinate
+# replies "validdate;ocean_depth:m", several reply one "lat;lon;validdate;ocean_depth:m" row each
+class MeteomaticsHandler(MockHandler):
+    def do_GET(self):
+        parts = urlparse(self.path).path.strip("/").split("/")
+        if len(parts) != 4 or parts[1] != "ocean_depth:m" or parts[3] != "csv":
+            self.send_body(404, "Not found", "text/plain")
+            return
+
+        validdate = parts[0]
+        try:
+            coordinates = [tuple(float(value) for value in point.split(",")) for point in parts[2].split("+")]
+            if any(len(point) != 2 for point in coordinates):
+                raise ValueError
+        except ValueError:
+            self.send_body(400, "Invalid coordinates", "text/plain")
+            return
+
+        if self.apply_faults():
+            return
+
+        self.server.count_request()
+        if len(coordinates) == 1:
+            latitude, longitude = coordinates[0]
+            self.send_body(200, f"validdate;ocean_depth:m\n{validdate};{fake_depth(latitude, longitude)}\n", "text/csv")
+            return
+        rows = [f"{latitude};{longitude};{validdate};{fake_depth(latitude, longitude)}" for latitude, longitude in coordinates]
+        self.send_body(200, "lat;lon;validdate;ocean_depth:m\n" + "\n".join(rows) + "\n", "text/csv")
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, handler_class, latency=0.0, port=0, error_rate=0.0, error_statuses=(429, 500, 503), seed=0,
+                 latency_jitter=0.0, rate_limit=None, rate_window=1.0, malformed_rate=0.0):
+        super().__init__(("127.0.0.1", port), handler_class)
+        self.latency = latency
+        self.latency_jitter = latency_jitter  # Extra uniform random latency, for tail latency tests
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.malformed_rate = malformed_rate  # Share of requests answered 200 with a non-JSON body
+        self.random = random.Random(seed)
+        self.outage_until = 0.0
+        self.rate_limit = rate_limit  # Requests allowed per rate_window seconds, None for unlimited
+        self.rate_window = rate_window
+        self.recent_requests = deque()
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.arrival_count = 0  # Every request received, including the ones answered with an error
+        self.scheduled_outage = None  # (arrival count, seconds) set by schedule_outage
+        self.error_count = 0
+        self.rate_limited_count = 0
+
+    # Sliding-window rate limit over the last rate_window seconds
+    def allow_request(self):
+        if self.rate_limit is None:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            while self.recent_requests and self.recent_requests[0] <= now - self.rate_window:
+                self.recent_requests.popleft()
+            if len(self.recent_requests) >= self.rate_limit:
+                self.rate_limited_count += 1
+                return False
+            self.recent_requests.append(now)
+            return True
+
+    def count_request(self):
+        with self.lock:
+            self.request_count += 1
+
+    # Starts a scheduled outage when its request arrives, so it lands at the same point of every run
+    def count_arrival(self):
+        with self.lock:
+            self.arrival_count += 1
+            if self.scheduled_outage and self.arrival_count >= self.scheduled_outage[0]:
+                self.outage_until = time.monotonic() + self.scheduled_outage[1]
+                self.scheduled_outage = None
+
+    # Clients closing keep-alive connections mid-read are expected during benchmarks
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+    # Answer every request with 503 for the next `seconds`
+    def start_outage(self, seconds):
+        self.outage_until = time.monotonic() + seconds
+
+    # Start a `seconds` outage once `requests` more requests have arrived
+    def schedule_outage(self, requests, seconds):
+        with self.lock:
+            self.scheduled_outage = (self.arrival_count + requests, seconds)
+
+
+def start_server(handler_class, path="", port=0, **config):
+    server = MockServer(handler_class, port=port, **config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+# Start the POWER stand-in on a background thread, returning the server and its endpoint URL
+def start_power_server(latency=0.0, port=0, error_rate=0.0, error_statuses=(429, 500, 503), seed=0, **config):
+    return start_server(PowerHandler, POWER_PATH, port, latency=latency, error_rate=error_rate,
+                        error_statuses=error_statuses, seed=seed, **config)
+
+
+# Start the Meteomatics stand-in; its URL replaces base_url in the depth scripts
+def start_meteomatics_server(latency=0.0, port=0, error_rate=0.0, error_statuses=(429, 500, 503), seed=0, **config):
+    return start_server(MeteomaticsHandler, "", port, latency=latency, error_rate=error_rate,
+                        error_statuses=error_statuses, seed=seed, **config)
+
+
+# Run a stand-in in its own process (multiprocessing target) so it doesn't share the client's
+# interpreter; the URL is sent back over `connection` and the server runs until the process ends
+def serve_in_process(kind, connection, config):
+    start = start_power_server if kind == "power" else start_meteomatics_server
+    server, url = start(**config)
+    connection.send(url)
+    while True:
+        time.sleep(3600)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local NASA POWER or Meteomatics stand-in server.")
+    parser.add_argument("kind", choices=["power", "meteomatics"])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, help="Requests allowed per --rate-window seconds")
+    parser.add_argument("--rate-window", type=float, default=1.0)
+    args = parser.parse_args()
+
+    start = start_power_server if args.kind == "power" else start_meteomatics_server
+    server, url = start(latency=args.latency, port=args.port, error_rate=args.error_rate, latency_jitter=args.latency_jitter,
+                        rate_limit=args.rate_limit, rate_window=args.rate_window)
+    print(f"{args.kind} stand-in listening on {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,158 @@
+import os
+import sys
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+# Multiprocess shore-distance enrichment. The query engines answer whole arrays at once, but in a
+# single process; for candidate grids of 10^5-10^6 points the work is split across a process pool
+# without pickling any large array per task:
+#   - project coordinates and the result arrays live in shared memory blocks;
+#   - the spatial index is shared too: arrays already memory-mapped from a file (a persisted coast
+#     index) are reopened by path, so every worker reads the same pages of the OS page cache, and
+#     in-memory arrays are copied once into shared memory;
+#   - each worker rebuilds its engine once, in the pool initializer, over the shared arrays (the
+#     KD-tree is built in C with copy_data=False), then tasks are just (start, stop) row ranges
+#     whose results are written straight into the shared outputs.
+# Workers are spawned rather than forked so the behaviour is the same on Linux, macOS and Windows;
+# scripts calling this need an `if __name__ == "__main__":` guard. Starting the pool costs about a
+# second, so queries stay in this process when the pool can't win: a single worker, a single core,
+# or fewer than min_parallel_points points. Depth lookups (DepthGrid.depth, ~10^7 points per second
+# in one process) never use the pool: spawning it takes longer than answering 10^6 points.
+
+data_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(data_dir, "Shore Distance", "Shore_Distance"))
+
+from coast_segments import SegmentShoreDistance
+from shore_engine import ShoreDistance
+
+# Rows per task: large enough to keep the per-task overhead negligible, small enough to balance
+chunk_size = 20_000
+
+# Smallest batch sent to the pool. Shore distance runs at ~5,600 points per second per core, so
+# 50,000 points is ~9 s of work against ~1 s to spawn the workers and rebuild the index in each,
+# and at least two tasks to share
+min_parallel_points = 50_000
+
+
+# Named numpy arrays that other processes can open without copying. `specs` is small and picklable;
+# SharedArrays(specs=...) in another process maps the same memory.
+class SharedArrays:
+    def __init__(self, arrays=None, specs=None):
+        self.blocks = []
+        self.owner = specs is None
+        if specs is None:
+            specs = {name: self.share(array) for name, array in arrays.items()}
+        self.specs = specs
+        self.arrays = {name: self.attach(spec) for name, spec in specs.items()}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def share(self, array):
+        # Arrays mapped from the whole tail of a file (np.memmap, np.load(mmap_mode="r")) are
+        # reopened by path; anything else, including slices of a mapping, is copied once
+        if isinstance(array, np.memmap) and array.filename and array.flags.c_contiguous \
+                and array.offset + array.nbytes == os.path.getsize(array.filename):
+            return {"file": array.filename, "offset": array.offset, "shape": array.shape, "dtype": array.dtype.str}
+        array = np.asarray(array, order="C")
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.blocks.append(block)
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        return {"shm": block.name, "shape": array.shape, "dtype": array.dtype.str}
+
+    def attach(self, spec):
+        if "file" in spec:
+            return np.memmap(spec["file"], dtype=spec["dtype"], mode="r", offset=spec["offset"], shape=tuple(spec["shape"]))
+        if self.owner:
+            block = next(block for block in self.blocks if block.name == spec["shm"])
+        else:
+            block = shared_memory.SharedMemory(name=spec["shm"])
+            self.blocks.append(block)
+        return np.ndarray(tuple(spec["shape"]), spec["dtype"], buffer=block.buf)
+
+    # Release the mappings; the creating process also frees the blocks
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = []
+
+
+# The arrays each engine is rebuilt from, and how to rebuild it
+def engine_arrays(engine):
+    if isinstance(engine, SegmentShoreDistance):
+        return "segments", {"start": engine.start, "end": engine.end, "start_unit": engine.start_unit,
+                            "end_unit": engine.end_unit, "midpoints": engine.midpoints,
+                            "max_radius": np.array(engine.max_radius)}
+    if isinstance(engine, ShoreDistance):
+        return "vertices", {"coast": engine.coast, "positions": engine.positions}
+    raise TypeError(f"Unsupported engine {type(engine).__name__}")
+
+
+def rebuild_engine(kind, arrays):
+    if kind == "segments":
+        return SegmentShoreDistance(arrays["start"], arrays["end"], arrays)
+    return ShoreDistance(arrays["coast"], arrays["positions"])
+
+
+# Worker state, set once per process by the pool initializer
+worker = {}
+
+
+def start_worker(kind, engine_specs, data_specs):
+    worker["engine_arrays"] = SharedArrays(specs=engine_specs)
+    worker["engine"] = rebuild_engine(kind, worker["engine_arrays"])
+    worker["data"] = SharedArrays(specs=data_specs)
+
+
+# Answer rows start:stop of the shared coordinates into the shared outputs
+def enrich_rows(bounds):
+    start, stop = bounds
+    data, engine = worker["data"], worker["engine"]
+    distances, coast_latitudes, coast_longitudes = engine.query(data["latitudes"][start:stop], data["longitudes"][start:stop])
+    data["distances"][start:stop] = distances
+    data["coast_latitudes"][start:stop] = coast_latitudes
+    data["coast_longitudes"][start:stop] = coast_longitudes
+    return stop - start
+
+
+# Workers worth starting for `points` points: 1 (answer in this process) when the pool can't win
+def pool_size(points, workers=None, min_points=min_parallel_points):
+    cores = os.cpu_count() or 1
+    workers = workers or cores
+    if workers <= 1 or cores == 1 or points < min_points:
+        return 1
+    return workers
+
+
+def run_parallel(engine, latitudes, longitudes, outputs, workers, chunk_size=chunk_size):
+    kind, arrays = engine_arrays(engine)
+    shared_engine = SharedArrays(arrays)
+    data = SharedArrays({"latitudes": latitudes, "longitudes": longitudes,
+                         **{name: np.zeros(len(latitudes)) for name in outputs}})
+    try:
+        tasks = [(start, min(start + chunk_size, len(latitudes))) for start in range(0, len(latitudes), chunk_size)]
+        with get_context("spawn").Pool(workers, start_worker, (kind, shared_engine.specs, data.specs)) as pool:
+            for _ in pool.imap_unordered(enrich_rows, tasks):
+                pass
+        return [data[name].copy() for name in outputs]
+    finally:
+        data.close()
+        shared_engine.close()
+
+
+# Distance to coast in metres plus the nearest coast point, like engine.query, across `workers`
+# processes (default: one per core); engine is a ShoreDistance or SegmentShoreDistance. Answered in
+# this process when pool_size says the pool can't win
+def parallel_shore_distance(engine, latitudes, longitudes, workers=None, chunk_size=chunk_size,
+                            min_points=min_parallel_points):
+    latitudes = np.asarray(latitudes, dtype=float).ravel()
+    longitudes = np.asarray(longitudes, dtype=float).ravel()
+    workers = pool_size(len(latitudes), workers, min_points)
+    if workers == 1:
+        return tuple(engine.query(latitudes, longitudes))
+    return tuple(run_parallel(engine, latitudes, longitudes, ["distances", "coast_latitudes", "coast_longitudes"],
+                              workers, chunk_size))
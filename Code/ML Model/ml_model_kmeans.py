@@ -4,10 +4,15 @@ from sklearn.cluster import KMeans
 from sklearn.preprocessing import LabelEncoder
 from sklearn.impute import SimpleImputer
 import seaborn as sns
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data"))
+from data_sources import load
 
 # Load the data
-file_path = "RDS5ML.csv"  # Update with your CSV file path
-data = pd.read_csv(file_path)
+# RDS5ML from Data/RDS5ML.xlsx, read through its cached Parquet copy (Code/Data/data_sources.py)
+data = load("RDS5ML")
 
 # Drop unnecessary columns and handle missing values
 data = data.drop(columns=["Owner"])
@@ -9,11 +9,16 @@ import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.model_selection import train_test_split
 import seaborn as sns
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data"))
+from data_sources import load
 
 # MODEL WITH BEST HYPER PARAMETERS AND KMEANS 7, UPDATED TO RDS5, WITH FEATURE INTERACTIONS, FEATURES PRUNED
 
-file_path = "RDS5ML.csv"  # Update with your CSV file path
-data = pd.read_csv(file_path)
+# RDS5ML from Data/RDS5ML.xlsx, read through its cached Parquet copy (Code/Data/data_sources.py)
+data = load("RDS5ML")
 
 # Drop unnecessary columns
 data = data.drop(columns=["Owner"])
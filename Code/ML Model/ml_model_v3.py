@@ -5,11 +5,16 @@ from sklearn.impute import SimpleImputer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, roc_auc_score
 from imblearn.over_sampling import SMOTE
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data"))
+from data_sources import load
 
 # MODEL WITH SMOTE IMPLEMENTED
 
-file_path = "RDS4ML.csv"  # Update with your CSV file path
-data = pd.read_csv(file_path)
+# RDS4ML from Data/RDS4ML.xlsx, read through its cached Parquet copy (Code/Data/data_sources.py)
+data = load("RDS4ML")
 
 data = data.drop(columns=["Owner"])
 
@@ -6,11 +6,16 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, roc_auc_score
 from imblearn.over_sampling import SMOTE
 from sklearn.model_selection import GridSearchCV
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data"))
+from data_sources import load
 
 # MODEL WITH HYPER PARAMETER TUNING
 
-file_path = "RDS4ML.csv"  # Update with your CSV file path
-data = pd.read_csv(file_path)
+# RDS4ML from Data/RDS4ML.xlsx, read through its cached Parquet copy (Code/Data/data_sources.py)
+data = load("RDS4ML")
 
 data = data.drop(columns=["Owner"])
 
@@ -6,11 +6,16 @@ from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
 import matplotlib.pyplot as plt
 import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data"))
+from data_sources import load
 
 # MODEL WITH BEST HYPER PARAMETERS
 
-file_path = "RDS4ML.csv"  # Update with your CSV file path
-data = pd.read_csv(file_path)
+# RDS4ML from Data/RDS4ML.xlsx, read through its cached Parquet copy (Code/Data/data_sources.py)
+data = load("RDS4ML")
 
 # Drop unnecessary columns
 data = data.drop(columns=["Owner"])
@@ -9,12 +9,17 @@ from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.metrics import classification_report, roc_auc_score
 import matplotlib.pyplot as plt
 import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data"))
+from data_sources import load
 
 # XGBOOST MODEL
 
 # Reload data to ensure we have longitude & latitude
-file_path = "RDS5ML.csv"  # Update with your CSV file path
-data = pd.read_csv(file_path)
+# RDS5ML from Data/RDS5ML.xlsx, read through its cached Parquet copy (Code/Data/data_sources.py)
+data = load("RDS5ML")
 
 # Drop 'Owner' as before
 data = data.drop(columns=["Owner"])